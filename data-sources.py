@@ -15,14 +15,71 @@ Usage:
 
 import os
 import sys
-import json
+import logging
 import requests
 import argparse
-import uuid
-import jwt
+import atexit
+import base64
+import functools
+import hashlib
+import re
+import secrets
+import tempfile
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
 from typing import Dict, Any, List
 from datetime import datetime
-from token_manager import TokenManager
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from token_manager import MAX_TOKEN_LIFETIME_MINUTES, TokenManager, dumps_json, loads_json
+
+# Directory containing this script; config and output files live here
+_SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Data source URLs must use http:// or https://
+_URL_RE = re.compile(r"^https?://", re.IGNORECASE)
+
+# Line editing and history for input() prompts (not available on Windows)
+try:
+    import readline
+
+    READLINE_AVAILABLE = True
+except ImportError:
+    READLINE_AVAILABLE = False
+
+INPUT_HISTORY_PATH = os.path.join(os.path.expanduser("~"), ".webex_byods_history")
+
+
+def write_json_file(filepath: str, data: Any) -> None:
+    """Write data to a file as indented JSON"""
+    with open(filepath, "wb") as f:
+        f.write(dumps_json(data, indent=True))
+
+
+def write_json_record_streaming(filepath: str, record: Dict[str, Any]) -> None:
+    """
+    Write a JSON object to a file, encoding list fields one item at a time.
+
+    Used for potentially large records such as the saved data sources list,
+    so the whole document is never serialized into a single buffer.
+    """
+    with open(filepath, "wb") as f:
+        f.write(b"{\n")
+        last = len(record) - 1
+        for n, (key, value) in enumerate(record.items()):
+            f.write(b"  " + dumps_json(key) + b": ")
+            if isinstance(value, list) and value:
+                f.write(b"[\n")
+                for i, item in enumerate(value):
+                    if i:
+                        f.write(b",\n")
+                    f.write(b"    " + dumps_json(item))
+                f.write(b"\n  ]")
+            else:
+                f.write(dumps_json(value))
+            f.write(b",\n" if n < last else b"\n")
+        f.write(b"}\n")
 
 
 class WebexDataSourceManager:
@@ -30,6 +87,29 @@ class WebexDataSourceManager:
 
     BASE_URL = "https://webexapis.com/v1"
 
+    # On-disk cache of the last data sources list, reused between runs. It is
+    # tagged with a hash of the API base URL and access token, so switching
+    # to another token or org never serves the previous org's list.
+    LIST_CACHE_PATH = os.path.join(
+        os.path.expanduser("~"), ".cache", "webex-byods", "list.json"
+    )
+    LIST_CACHE_TTL_SECONDS = 30
+
+    # Error bodies larger than this are truncated for display
+    MAX_ERROR_BODY_BYTES = 64 * 1024
+    ERROR_PREVIEW_BYTES = 4 * 1024
+
+    # Retry transient gateway errors and connection failures with exponential
+    # backoff. Only idempotent verbs are retried so a POST (registration) is
+    # never sent twice. The final 5xx response is returned rather than raised.
+    RETRY_POLICY = Retry(
+        total=3,
+        backoff_factor=0.3,
+        status_forcelist=[502, 503, 504],
+        allowed_methods=frozenset(["GET", "PUT"]),
+        raise_on_status=False,
+    )
+
     def __init__(self, access_token: str):
         """Initialize with access token"""
         self.access_token = access_token
@@ -40,6 +120,27 @@ class WebexDataSourceManager:
         }
         self.schemas_cache = None  # Cache for schemas
 
+        # Last data sources list and its ETag, for conditional refreshes
+        self._list_etag = None
+        self._last_list = None
+
+        # Persistent session so every API call reuses the same keep-alive
+        # connection instead of paying for a new TCP + TLS handshake
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+        adapter = HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=10,
+            max_retries=self.RETRY_POLICY,
+        )
+        self.session.mount("https://", adapter)
+
+        # Background worker so list refreshes can overlap with other work
+        self._background = ThreadPoolExecutor(max_workers=1)
+
+        # Serializes 401 token refreshes between worker threads
+        self._token_lock = threading.Lock()
+
         # Initialize token manager for automatic refresh
         try:
             self.token_manager = TokenManager()
@@ -50,6 +151,10 @@ class WebexDataSourceManager:
         """
         Check if a 401 response indicates token expiration and refresh if possible.
 
+        Safe to call from several worker threads at once (see get_many_details):
+        only the first thread to see the expired token refreshes it, and the
+        others retry with the token it fetched.
+
         Args:
             response: The response object to check
 
@@ -57,29 +162,69 @@ class WebexDataSourceManager:
             bool: True if token was refreshed, False otherwise
         """
         if response.status_code == 401 and self.token_manager:
-            try:
-                print("🔄 Access token appears to be expired, attempting refresh...")
-                new_token = self.token_manager.refresh_token()
+            # The token this request was sent with
+            sent = response.request.headers.get("Authorization", "")
+            stale_token = sent[len("Bearer "):] if sent.startswith("Bearer ") else None
 
-                # Update the instance with new token
-                self.access_token = new_token
-                self.headers["Authorization"] = f"Bearer {new_token}"
+            with self._token_lock:
+                # Another thread already replaced the rejected token
+                if stale_token is not None and stale_token != self.access_token:
+                    return True
 
-                print("✅ Token refreshed successfully!")
-                return True
+                try:
+                    print("🔄 Access token appears to be expired, attempting refresh...")
+                    new_token = self.token_manager.refresh_token(stale_token=stale_token)
 
-            except Exception as e:
-                print(f"❌ Failed to refresh token: {e}")
-                return False
+                    # Update the instance with new token
+                    self.access_token = new_token
+                    self.headers["Authorization"] = f"Bearer {new_token}"
+                    self.session.headers["Authorization"] = f"Bearer {new_token}"
+
+                    print("✅ Token refreshed successfully!")
+                    return True
+
+                except Exception as e:
+                    print(f"❌ Failed to refresh token: {e}")
+                    return False
         return False
 
-    def _make_request(self, method: str, url: str, **kwargs) -> Dict[str, Any]:
+    def _error_text(self, response: requests.Response) -> str:
+        """
+        Get the body of an error response for display.
+
+        Very large bodies (such as an HTML error page from a gateway) are cut
+        down to a short preview, and the full body is saved to a temporary file.
+
+        Args:
+            response: The unsuccessful response
+
+        Returns:
+            str: The error text to show the user
+        """
+        body = response.content
+        if len(body) <= self.MAX_ERROR_BODY_BYTES:
+            return response.text
+
+        preview = body[: self.ERROR_PREVIEW_BYTES].decode("utf-8", errors="replace")
+        try:
+            with tempfile.NamedTemporaryFile(
+                mode="wb", delete=False, prefix="webex-byods-error-", suffix=".txt"
+            ) as f:
+                f.write(body)
+            return f"{preview}\n... (truncated, full response saved to {f.name})"
+        except OSError:
+            return f"{preview}\n... (truncated, {len(body)} bytes total)"
+
+    def _make_request(
+        self, method: str, url: str, include_etag: bool = False, **kwargs
+    ) -> Dict[str, Any]:
         """
         Make an HTTP request with automatic token refresh on 401 errors.
 
         Args:
             method: HTTP method (GET, POST, PUT, DELETE)
             url: Request URL
+            include_etag: Add the response's ETag header to the result as "etag"
             **kwargs: Additional arguments for requests
 
         Returns:
@@ -87,27 +232,34 @@ class WebexDataSourceManager:
         """
         try:
             # Make the initial request
-            response = requests.request(
-                method, url, headers=self.headers, timeout=30, **kwargs
-            )
+            response = self.session.request(method, url, timeout=30, **kwargs)
 
             # If we get a 401, try to refresh the token and retry once
             if response.status_code == 401 and self._refresh_token_if_needed(response):
                 print("🔄 Retrying request with refreshed token...")
-                response = requests.request(
-                    method, url, headers=self.headers, timeout=30, **kwargs
-                )
+                response = self.session.request(method, url, timeout=30, **kwargs)
 
             if response.status_code in [200, 201]:
-                return {
+                try:
+                    data = loads_json(response.content)
+                except ValueError as e:
+                    return {
+                        "success": False,
+                        "error": f"Invalid JSON in response: {str(e)}",
+                        "status_code": response.status_code,
+                    }
+                result = {
                     "success": True,
-                    "data": response.json(),
+                    "data": data,
                     "status_code": response.status_code,
                 }
+                if include_etag:
+                    result["etag"] = response.headers.get("ETag")
+                return result
             else:
                 return {
                     "success": False,
-                    "error": response.text,
+                    "error": self._error_text(response),
                     "status_code": response.status_code,
                 }
 
@@ -118,29 +270,137 @@ class WebexDataSourceManager:
                 "status_code": None,
             }
 
-    def list_all_data_sources(self) -> Dict[str, Any]:
-        """Retrieve all data sources"""
+    def close(self) -> None:
+        """Close the underlying HTTP session and its pooled connections"""
+        self._background.shutdown(wait=False)
+        self.session.close()
+
+    def _list_cache_key(self) -> str:
+        """Identify the API endpoint and credentials the list was fetched with"""
+        return hashlib.sha256(
+            f"{self.BASE_URL}\n{self.access_token}".encode("utf-8")
+        ).hexdigest()
+
+    def _read_list_cache(self) -> Any:
+        """Return the cached data sources list if it is fresh and ours, else None"""
+        try:
+            cache_age = time.time() - os.path.getmtime(self.LIST_CACHE_PATH)
+            if cache_age > self.LIST_CACHE_TTL_SECONDS:
+                return None
+            with open(self.LIST_CACHE_PATH, "rb") as f:
+                cached = loads_json(f.read())
+            if cached.get("key") != self._list_cache_key():
+                return None
+            return cached["data"]
+        except (OSError, ValueError, KeyError, AttributeError):
+            return None
+
+    def _write_list_cache(self, data: Any) -> None:
+        """Atomically store the data sources list in the on-disk cache"""
+        try:
+            cache_dir = os.path.dirname(self.LIST_CACHE_PATH)
+            os.makedirs(cache_dir, exist_ok=True)
+            temp_file = tempfile.NamedTemporaryFile(
+                delete=False, dir=cache_dir, prefix=".list-", suffix=".tmp"
+            )
+            temp_file.close()
+            try:
+                write_json_file(
+                    temp_file.name, {"key": self._list_cache_key(), "data": data}
+                )
+                os.replace(temp_file.name, self.LIST_CACHE_PATH)
+            except Exception:
+                os.unlink(temp_file.name)
+                raise
+        except Exception as e:
+            print(f"Warning: Could not write data sources cache: {str(e)}")
+
+    def _invalidate_list_cache(self) -> None:
+        """Drop the cached list so the next run can't serve it after a change"""
+        try:
+            os.unlink(self.LIST_CACHE_PATH)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            print(f"Warning: Could not remove data sources cache: {str(e)}")
+
+    def list_all_data_sources(self, use_cache: bool = False) -> Dict[str, Any]:
+        """
+        Retrieve all data sources.
+
+        Args:
+            use_cache: Serve the list from the on-disk cache if it is fresh
+
+        Returns:
+            Dict containing success status, data/error, and status code.
+            A status code of 304 means the list is unchanged since the last
+            call and the previously fetched data is returned.
+        """
+        if use_cache:
+            cached = self._read_list_cache()
+            if cached is not None:
+                print("Using cached data sources list (use --no-cache to bypass)")
+                return {"success": True, "data": cached, "status_code": 200}
+
         url = f"{self.BASE_URL}/dataSources"
-        return self._make_request("GET", url)
+
+        # Ask the server to skip the body if the list hasn't changed
+        headers = {}
+        if self._list_etag and self._last_list is not None:
+            headers["If-None-Match"] = self._list_etag
+
+        result = self._make_request("GET", url, include_etag=True, headers=headers)
+
+        if result["status_code"] == 304:
+            self._write_list_cache(self._last_list)
+            return {"success": True, "data": self._last_list, "status_code": 304}
+
+        if result["success"]:
+            self._list_etag = result.pop("etag", None)
+            self._last_list = result["data"]
+            self._write_list_cache(result["data"])
+        return result
+
+    def list_all_data_sources_in_background(self) -> Future:
+        """Start fetching all data sources without blocking the caller"""
+        return self._background.submit(self.list_all_data_sources)
 
     def get_data_source_details(self, data_source_id: str) -> Dict[str, Any]:
         """Retrieve details for a specific data source"""
         url = f"{self.BASE_URL}/dataSources/{data_source_id}"
         return self._make_request("GET", url)
 
+    def get_many_details(self, data_source_ids: List[str]) -> List[Dict[str, Any]]:
+        """Retrieve details for several data sources concurrently
+
+        Requests are issued in parallel over the session's connection pool.
+        Results are returned in the same order as the given IDs.
+        """
+        if not data_source_ids:
+            return []
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            return list(executor.map(self.get_data_source_details, data_source_ids))
+
     def register_data_source(
         self, data_source_config: Dict[str, Any]
     ) -> Dict[str, Any]:
         """Register a new data source"""
         url = f"{self.BASE_URL}/dataSources"
-        return self._make_request("POST", url, json=data_source_config)
+        result = self._make_request("POST", url, json=data_source_config)
+        if result["success"]:
+            self._invalidate_list_cache()
+        return result
 
     def update_data_source(
         self, data_source_id: str, update_config: Dict[str, Any]
     ) -> Dict[str, Any]:
         """Update a data source"""
         url = f"{self.BASE_URL}/dataSources/{data_source_id}"
-        return self._make_request("PUT", url, json=update_config)
+        result = self._make_request("PUT", url, json=update_config)
+        if result["success"]:
+            self._invalidate_list_cache()
+        return result
 
     def get_data_source_schemas(self) -> Dict[str, Any]:
         """Retrieve all available data source schemas"""
@@ -181,11 +441,31 @@ class WebexDataSourceManager:
         return self.schemas_cache
 
 
+def _save_input_history() -> None:
+    """Persist the prompt history for the next run"""
+    try:
+        readline.write_history_file(INPUT_HISTORY_PATH)
+    except OSError:
+        pass
+
+
+def setup_input_history() -> None:
+    """Enable up-arrow recall of previous answers across runs"""
+    if not READLINE_AVAILABLE:
+        return
+
+    readline.set_history_length(1000)
+    try:
+        readline.read_history_file(INPUT_HISTORY_PATH)
+    except OSError:
+        pass  # No history yet
+    atexit.register(_save_input_history)
+
+
 def load_env_token() -> str:
     """Get a fresh service app access token from token-config.json"""
     # Load token-config.json from the same directory as the script
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    config_path = os.path.join(script_dir, "token-config.json")
+    config_path = os.path.join(_SCRIPT_DIR, "token-config.json")
 
     try:
         from token_manager import TokenManager
@@ -208,12 +488,23 @@ def load_env_token() -> str:
         sys.exit(1)
 
 
+@functools.lru_cache(maxsize=256)
+def _decode_jwt_cached(token: str) -> tuple:
+    """Decode a JWT once and cache its claims as an immutable tuple of items"""
+    # We only read the claims and never verify the signature, so decode the
+    # base64url payload segment directly instead of going through PyJWT
+    _, payload_b64, _ = token.split(".", 2)
+    padding = "=" * (-len(payload_b64) % 4)
+    claims = loads_json(base64.urlsafe_b64decode(payload_b64 + padding))
+    if not isinstance(claims, dict):
+        raise ValueError("JWT payload is not a JSON object")
+    return tuple(claims.items())
+
+
 def decode_jwt_token(token: str) -> Dict[str, Any]:
     """Decode JWT token to extract audience and subject"""
     try:
-        # Decode without verification since we just need to read the payload
-        decoded = jwt.decode(token, options={"verify_signature": False})
-        return decoded
+        return dict(_decode_jwt_cached(token))
     except Exception as e:
         print(f"Warning: Could not decode JWT token: {str(e)}")
         return {}
@@ -260,7 +551,7 @@ def get_token_expiration_display(data_source: Dict[str, Any]) -> str:
             return "No token found"
 
         # Decode the JWT token to get expiration
-        decoded = jwt.decode(jws_token, options={"verify_signature": False})
+        decoded = dict(_decode_jwt_cached(jws_token))
         exp_timestamp = decoded.get("exp")
 
         if not exp_timestamp:
@@ -290,32 +581,38 @@ def get_token_expiration_display(data_source: Dict[str, Any]) -> str:
         return f"Parse error: {str(e)[:15]}"
 
 
+def enrich_data_sources(data_sources: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Enhance every data source with its JWT claims, once per fetched list"""
+    return [enhance_data_source_with_jwt(ds) for ds in data_sources]
+
+
 def display_data_sources_list(
-    data_sources: List[Dict[str, Any]], manager: WebexDataSourceManager = None
+    enriched: List[Dict[str, Any]], manager: WebexDataSourceManager = None
 ) -> None:
-    """Display a formatted list of data sources"""
-    if not data_sources:
+    """Display a formatted list of already-enriched data sources"""
+    if not enriched:
         print("No data sources found.")
         return
 
-    print(f"\nFound {len(data_sources)} data source(s):")
-    print("=" * 70)
-    print(f"{'#':<3} {'ID':<36} {'Status':<10} {'Audience':<15} {'URL':<15}")
-    print("-" * 70)
-
-    for i, ds in enumerate(data_sources, 1):
-        # Enhance with JWT data
-        enhanced_ds = enhance_data_source_with_jwt(ds)
+    # Build the whole table first and emit it with a single write
+    lines = [
+        f"\nFound {len(enriched)} data source(s):",
+        "=" * 70,
+        f"{'#':<3} {'ID':<36} {'Status':<10} {'Audience':<15} {'URL':<15}",
+        "-" * 70,
+    ]
 
+    for i, enhanced_ds in enumerate(enriched, 1):
         ds_id = enhanced_ds.get("id", "N/A")[:36]
         status = enhanced_ds.get("status", "N/A")
         audience = enhanced_ds.get("audience", "N/A")[:15]
         url = enhanced_ds.get("url", "N/A")[:15] + (
             "..." if len(enhanced_ds.get("url", "")) > 15 else ""
         )
-        print(f"{i:<3} {ds_id:<36} {status:<10} {audience:<15} {url:<15}")
+        lines.append(f"{i:<3} {ds_id:<36} {status:<10} {audience:<15} {url:<15}")
 
-    print("-" * 70)
+    lines.append("-" * 70)
+    print("\n".join(lines))
 
 
 def display_data_source_details(
@@ -325,16 +622,15 @@ def display_data_source_details(
     # Enhance with JWT data
     enhanced_ds = enhance_data_source_with_jwt(data_source)
 
-    print("\n" + "=" * 60)
-    print("DATA SOURCE DETAILS")
-    print("=" * 60)
-
     # Get friendly schema display name if manager is available
     schema_id = enhanced_ds.get("schemaId", "N/A")
     schema_display = schema_id
     if manager is not None and schema_id != "N/A":
         schema_display = manager.get_schema_display_name(schema_id)
 
+    # Build the whole block first and emit it with a single write
+    lines = ["\n" + "=" * 60, "DATA SOURCE DETAILS", "=" * 60]
+
     details = [
         ("ID", enhanced_ds.get("id", "N/A")),
         ("Status", enhanced_ds.get("status", "N/A")),
@@ -352,31 +648,31 @@ def display_data_source_details(
     for label, value in details:
         if label == "Nonce" and value != "N/A" and len(str(value)) > 16:
             # Mask nonce for security
-            masked_value = f"{str(value)[:8]}...{str(value)[-8:]}"
-            print(f"{label:<20}: {masked_value}")
-        else:
-            print(f"{label:<20}: {value}")
+            value = f"{str(value)[:8]}...{str(value)[-8:]}"
+        lines.append(f"{label:<20}: {value}")
 
     # Show error message if present
     if "errorMessage" in enhanced_ds and enhanced_ds["errorMessage"]:
-        print(f"{'Error Message':<20}: {enhanced_ds['errorMessage']}")
+        lines.append(f"{'Error Message':<20}: {enhanced_ds['errorMessage']}")
 
     # Show JWT token info if available
     if "jwt_claims" in enhanced_ds and enhanced_ds["jwt_claims"]:
         jwt_claims = enhanced_ds["jwt_claims"]
-        print(f"\n{'JWT Token Claims':<20}:")
+        lines.append(f"\n{'JWT Token Claims':<20}:")
         if jwt_claims.get("aud"):
-            print(f"{'  Audience (aud)':<20}: {jwt_claims['aud']}")
+            lines.append(f"{'  Audience (aud)':<20}: {jwt_claims['aud']}")
         if jwt_claims.get("sub"):
-            print(f"{'  Subject (sub)':<20}: {jwt_claims['sub']}")
+            lines.append(f"{'  Subject (sub)':<20}: {jwt_claims['sub']}")
         if jwt_claims.get("iss"):
-            print(f"{'  Issuer (iss)':<20}: {jwt_claims['iss']}")
+            lines.append(f"{'  Issuer (iss)':<20}: {jwt_claims['iss']}")
         if jwt_claims.get("exp"):
             exp_time = datetime.fromtimestamp(jwt_claims["exp"])
-            print(f"{'  Expires (exp)':<20}: {exp_time.isoformat()}")
+            lines.append(f"{'  Expires (exp)':<20}: {exp_time.isoformat()}")
         if jwt_claims.get("iat"):
             iat_time = datetime.fromtimestamp(jwt_claims["iat"])
-            print(f"{'  Issued (iat)':<20}: {iat_time.isoformat()}")
+            lines.append(f"{'  Issued (iat)':<20}: {iat_time.isoformat()}")
+
+    print("\n".join(lines))
 
 
 def select_schema_interactive(
@@ -443,10 +739,10 @@ def get_registration_config(manager: WebexDataSourceManager) -> Dict[str, Any]:
 
     # Default values
     default_audience = "BYODS"
-    default_nonce = str(uuid.uuid4())
+    default_nonce = secrets.token_urlsafe(24)
     default_subject = "BYODS"
     default_schema_id = "5397013b-7920-4ffc-807c-e8a3e0a18f43"
-    default_token_lifetime = 1440
+    default_token_lifetime = MAX_TOKEN_LIFETIME_MINUTES
 
     # Required fields with defaults
     audience_input = input(
@@ -477,19 +773,21 @@ def get_registration_config(manager: WebexDataSourceManager) -> Dict[str, Any]:
         return {}
 
     # Validate URL format
-    if not config["url"].startswith(("http://", "https://")):
+    if not _URL_RE.match(config["url"]):
         print("Error: URL must start with http:// or https://")
         return {}
 
     # Token lifetime with default
     lifetime_input = input(
-        f"Token Lifetime Minutes (1-1440) [{default_token_lifetime}]: "
+        f"Token Lifetime Minutes (1-{MAX_TOKEN_LIFETIME_MINUTES}) [{default_token_lifetime}]: "
     ).strip()
     if lifetime_input:
         try:
             config["tokenLifetimeMinutes"] = int(lifetime_input)
-            if not (1 <= config["tokenLifetimeMinutes"] <= 1440):
-                print("Error: Token lifetime must be between 1 and 1440 minutes")
+            if not (1 <= config["tokenLifetimeMinutes"] <= MAX_TOKEN_LIFETIME_MINUTES):
+                print(
+                    f"Error: Token lifetime must be between 1 and {MAX_TOKEN_LIFETIME_MINUTES} minutes"
+                )
                 return {}
         except ValueError:
             print("Error: Please enter a valid number")
@@ -517,7 +815,7 @@ def get_update_config(
     config = {}
 
     # Generate new nonce (required for security)
-    default_nonce = str(uuid.uuid4())
+    default_nonce = secrets.token_urlsafe(24)
 
     # Required fields with current values as defaults
     current_audience = enhanced_data.get("audience", "")
@@ -542,20 +840,22 @@ def get_update_config(
     config["url"] = url_input if url_input else current_url
 
     # Validate URL format if provided
-    if config["url"] and not config["url"].startswith(("http://", "https://")):
+    if config["url"] and not _URL_RE.match(config["url"]):
         print("Error: URL must start with http:// or https://")
         return {}
 
     # Token lifetime
-    current_lifetime = enhanced_data.get("tokenLifetimeMinutes", 1440)
+    current_lifetime = enhanced_data.get("tokenLifetimeMinutes", MAX_TOKEN_LIFETIME_MINUTES)
     lifetime_input = input(
-        f"Token Lifetime Minutes (1-1440) [{current_lifetime}]: "
+        f"Token Lifetime Minutes (1-{MAX_TOKEN_LIFETIME_MINUTES}) [{current_lifetime}]: "
     ).strip()
     if lifetime_input:
         try:
             config["tokenLifetimeMinutes"] = int(lifetime_input)
-            if not (1 <= config["tokenLifetimeMinutes"] <= 1440):
-                print("Error: Token lifetime must be between 1 and 1440 minutes")
+            if not (1 <= config["tokenLifetimeMinutes"] <= MAX_TOKEN_LIFETIME_MINUTES):
+                print(
+                    f"Error: Token lifetime must be between 1 and {MAX_TOKEN_LIFETIME_MINUTES} minutes"
+                )
                 return {}
         except ValueError:
             print("Error: Please enter a valid number")
@@ -592,65 +892,116 @@ def get_update_config(
     return config
 
 
-def display_main_menu(data_sources: List[Dict[str, Any]]) -> None:
-    """Display the main menu options"""
-    print("\n" + "=" * 60)
-    print("WEBEX DATA SOURCE MANAGER")
-    print("=" * 60)
+def build_menu_entries(enriched: List[Dict[str, Any]]) -> List[str]:
+    """Build the static "N. View/Update: audience (status)" menu line prefixes"""
+    return [
+        f"{i}. View/Update: {ds.get('audience', 'N/A')} ({ds.get('status', 'N/A')})"
+        for i, ds in enumerate(enriched, 1)
+    ]
 
-    if data_sources:
-        for i, ds in enumerate(data_sources, 1):
-            enhanced_ds = enhance_data_source_with_jwt(ds)
-            audience = enhanced_ds.get("audience", "N/A")
-            status = enhanced_ds.get("status", "N/A")
-            token_expires = get_token_expiration_display(ds)
-            print(f"{i}. View/Update: {audience} ({status}) - Expires: {token_expires}")
-        print()
 
-    print(f"{len(data_sources) + 1}. Register New Data Source")
-    print(f"{len(data_sources) + 2}. Quick Extend Token (No Config Changes)")
-    print(f"{len(data_sources) + 3}. Refresh Data Sources List")
-    print("q. Quit")
+def display_main_menu(
+    enriched: List[Dict[str, Any]], menu_entries: List[str] = None
+) -> None:
+    """
+    Display the main menu options for already-enriched data sources.
+
+    Args:
+        enriched: The enriched data sources
+        menu_entries: Prefixes from build_menu_entries(), reused across redraws.
+            Token expiry is time-dependent so it is always computed fresh.
+    """
+    if menu_entries is None:
+        menu_entries = build_menu_entries(enriched)
+
+    # Build the whole menu first and emit it with a single write
+    lines = ["\n" + "=" * 60, "WEBEX DATA SOURCE MANAGER", "=" * 60]
+
+    if enriched:
+        for entry, enhanced_ds in zip(menu_entries, enriched):
+            token_expires = get_token_expiration_display(enhanced_ds)
+            lines.append(f"{entry} - Expires: {token_expires}")
+        lines.append("")
+
+    lines.extend(
+        [
+            f"{len(enriched) + 1}. Register New Data Source",
+            f"{len(enriched) + 2}. Quick Extend Token (No Config Changes)",
+            f"{len(enriched) + 3}. Refresh Data Sources List",
+            "q. Quit",
+        ]
+    )
+    print("\n".join(lines))
 
 
 def get_main_menu_choice(data_sources: List[Dict[str, Any]]) -> str:
     """Get user's main menu choice"""
-    max_option = len(data_sources) + 3
+    count = len(data_sources)
+    max_option = count + 3
+
+    # Map every valid input to its action once, data sources to 0-based indices
+    dispatch = {str(i + 1): str(i) for i in range(count)}
+    dispatch.update(
+        {
+            "q": "quit",
+            "quit": "quit",
+            str(count + 1): "register",
+            str(count + 2): "extend",
+            str(count + 3): "refresh",
+        }
+    )
+
     while True:
         choice = input(f"\nEnter your choice (1-{max_option} or 'q'): ").strip().lower()
 
-        if choice == "q" or choice == "quit":
-            return "quit"
-
-        if choice == str(len(data_sources) + 1):
-            return "register"
-
-        if choice == str(len(data_sources) + 2):
-            return "extend"
-
-        if choice == str(len(data_sources) + 3):
-            return "refresh"
-
+        # Normalise numeric input the way int() reads it ("01", "+1", "1_0")
         try:
-            choice_num = int(choice)
-            if 1 <= choice_num <= len(data_sources):
-                return str(choice_num - 1)  # Return 0-based index
+            choice = str(int(choice))
         except ValueError:
             pass
 
+        action = dispatch.get(choice)
+        if action is not None:
+            return action
+
         print(f"Please enter a number between 1 and {max_option}, or 'q' to quit")
 
 
+# Single background writer for audit records so disk I/O never blocks the menu.
+# Pending writes are flushed before the interpreter exits.
+_io_executor = ThreadPoolExecutor(max_workers=1)
+atexit.register(_io_executor.shutdown, wait=True)
+
+# Record writes whose outcome has not been reported yet. The worker never
+# prints; the menu loop reports outcomes so they don't land inside a prompt.
+_pending_record_writes: List[Future] = []
+
+
+def _write_operation_record(filepath: str, operation_record: Dict[str, Any]) -> str:
+    """Write an operation record and return the outcome message (never raises)"""
+    try:
+        write_json_file(filepath, operation_record)
+    except Exception as e:
+        return f"Warning: Could not save operation record to file: {str(e)}"
+    return f"📄 Operation record saved to: {os.path.basename(filepath)}"
+
+
+def report_operation_records() -> None:
+    """Wait for pending operation record writes and print their outcomes"""
+    while _pending_record_writes:
+        print(_pending_record_writes.pop(0).result())
+
+
 def save_operation_record(
     operation_type: str, config: Dict[str, Any], result: Dict[str, Any]
 ) -> str:
-    """Save operation record to JSON file"""
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    """Save operation record to JSON file in the background"""
+    now = datetime.now()
+    timestamp = now.strftime("%Y%m%d_%H%M%S")
 
     # Create operation record
     operation_record = {
-        "operation_timestamp": datetime.now().isoformat(),
+        "operation_timestamp": now.isoformat(),
         "operation_type": operation_type,
         "configuration": config,
         "api_response": result,
@@ -664,30 +1015,41 @@ def save_operation_record(
     else:
         filename = f"data_source_{operation_type}_failed_{timestamp}.json"
 
-    filepath = os.path.join(script_dir, filename)
-
-    try:
-        with open(filepath, "w") as f:
-            json.dump(operation_record, f, indent=2)
+    filepath = os.path.join(_SCRIPT_DIR, filename)
 
-        print(f"\n📄 Operation record saved to: {os.path.basename(filepath)}")
-        return filepath
-    except Exception as e:
-        print(f"Warning: Could not save operation record to file: {str(e)}")
-        return ""
+    # The outcome is reported by report_operation_records() before the next menu
+    _pending_record_writes.append(
+        _io_executor.submit(_write_operation_record, filepath, operation_record)
+    )
+    return filepath
 
 
 def main():
     """Main function"""
+    # Show TokenManager status messages the way they used to be printed
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
     parser = argparse.ArgumentParser(description="Webex Data Source Manager")
     parser.add_argument(
         "--save-list",
         action="store_true",
         help="Save the data sources list to a JSON file on startup",
     )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Always fetch the data sources list from the API on startup",
+    )
+    parser.add_argument(
+        "--include-details",
+        action="store_true",
+        help="With --save-list, also fetch and save full details for each data source",
+    )
 
     args = parser.parse_args()
 
+    setup_input_history()
+
+    manager = None
     try:
         # Load access token
         access_token = load_env_token()
@@ -702,8 +1064,8 @@ def main():
         # Load schemas cache for friendly display
         manager.load_schemas_cache()
 
-        # Get all data sources initially
-        result = manager.list_all_data_sources()
+        # Get all data sources initially (a very recent list is reused from disk)
+        result = manager.list_all_data_sources(use_cache=not args.no_cache)
 
         if not result["success"]:
             print("❌ Failed to retrieve data sources!")
@@ -712,29 +1074,46 @@ def main():
             sys.exit(1)
 
         data_sources = result["data"].get("items", [])
+        enriched_data_sources = enrich_data_sources(data_sources)
 
         # Save list if requested
         if args.save_list and data_sources:
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            now = datetime.now()
+            timestamp = now.strftime("%Y%m%d_%H%M%S")
             filename = f"data_sources_list_{timestamp}.json"
-            filepath = os.path.join(
-                os.path.dirname(os.path.abspath(__file__)), filename
-            )
+            filepath = os.path.join(_SCRIPT_DIR, filename)
 
             data_record = {
-                "retrieved_timestamp": datetime.now().isoformat(),
+                "retrieved_timestamp": now.isoformat(),
                 "count": len(data_sources),
                 "data_sources": data_sources,
             }
 
-            with open(filepath, "w") as f:
-                json.dump(data_record, f, indent=2)
+            if args.include_details:
+                print("Fetching details for all data sources...")
+                details_results = manager.get_many_details(
+                    [ds["id"] for ds in data_sources]
+                )
+                data_record["details"] = [
+                    r["data"] if r["success"] else {"error": r["error"]}
+                    for r in details_results
+                ]
+
+            write_json_record_streaming(filepath, data_record)
             print(f"📄 Data sources list saved to: {filename}")
 
         # Main interactive loop
+        menu_entries = None
+        menu_entries_source = None
         while True:
-            display_data_sources_list(data_sources, manager)
-            display_main_menu(data_sources)
+            # Menu lines only change when the list is re-fetched
+            if menu_entries_source is not enriched_data_sources:
+                menu_entries = build_menu_entries(enriched_data_sources)
+                menu_entries_source = enriched_data_sources
+
+            report_operation_records()
+            display_data_sources_list(enriched_data_sources, manager)
+            display_main_menu(enriched_data_sources, menu_entries)
 
             choice = get_main_menu_choice(data_sources)
 
@@ -744,8 +1123,11 @@ def main():
             elif choice == "refresh":
                 print("Refreshing data sources...")
                 result = manager.list_all_data_sources()
-                if result["success"]:
+                if result["status_code"] == 304:
+                    print("✅ No changes since the last refresh.")
+                elif result["success"]:
                     data_sources = result["data"].get("items", [])
+                    enriched_data_sources = enrich_data_sources(data_sources)
                     print("✅ Data sources refreshed!")
                 else:
                     print("❌ Failed to refresh data sources!")
@@ -762,11 +1144,10 @@ def main():
                 print("=" * 40)
                 print("Select a data source to extend its token:")
 
-                for i, ds in enumerate(data_sources, 1):
-                    enhanced_ds = enhance_data_source_with_jwt(ds)
+                for i, enhanced_ds in enumerate(enriched_data_sources, 1):
                     audience = enhanced_ds.get("audience", "N/A")
                     status = enhanced_ds.get("status", "N/A")
-                    token_expires = get_token_expiration_display(ds)
+                    token_expires = get_token_expiration_display(enhanced_ds)
                     print(
                         f"{i}. {audience} ({status}) - Token expires in: {token_expires}"
                     )
@@ -791,52 +1172,51 @@ def main():
 
                             # Get token lifetime
                             lifetime_input = input(
-                                "\nToken lifetime in minutes (default 1440 = 24 hours, max 1440): "
+                                f"\nToken lifetime in minutes (default {MAX_TOKEN_LIFETIME_MINUTES} = 24 hours, "
+                                f"max {MAX_TOKEN_LIFETIME_MINUTES}): "
                             ).strip()
-                            token_lifetime = 1440  # Default 24 hours (maximum allowed)
+                            token_lifetime = MAX_TOKEN_LIFETIME_MINUTES  # Default 24 hours (maximum allowed)
 
                             if lifetime_input:
                                 try:
                                     token_lifetime = int(lifetime_input)
-                                    if token_lifetime > 1440:
+                                    if token_lifetime > MAX_TOKEN_LIFETIME_MINUTES:
                                         print(
-                                            "Token lifetime cannot exceed 1440 minutes (24 hours). Using maximum (1440 minutes)."
+                                            f"Token lifetime cannot exceed {MAX_TOKEN_LIFETIME_MINUTES} minutes (24 hours). "
+                                            f"Using maximum ({MAX_TOKEN_LIFETIME_MINUTES} minutes)."
                                         )
-                                        token_lifetime = 1440
+                                        token_lifetime = MAX_TOKEN_LIFETIME_MINUTES
                                     elif token_lifetime <= 0:
                                         print(
-                                            "Token lifetime must be positive. Using default (1440 minutes)."
+                                            f"Token lifetime must be positive. Using default ({MAX_TOKEN_LIFETIME_MINUTES} minutes)."
                                         )
-                                        token_lifetime = 1440
+                                        token_lifetime = MAX_TOKEN_LIFETIME_MINUTES
                                 except ValueError:
                                     print(
-                                        "Invalid number. Using default (1440 minutes)."
+                                        f"Invalid number. Using default ({MAX_TOKEN_LIFETIME_MINUTES} minutes)."
                                     )
-                                    token_lifetime = 1440
+                                    token_lifetime = MAX_TOKEN_LIFETIME_MINUTES
 
                             print(f"\nExtending token for data source: {ds_id}")
                             print(
                                 f"Token lifetime: {token_lifetime} minutes ({token_lifetime / 60:.1f} hours)"
                             )
 
-                            # Initialize token manager and extend the data source token
-                            token_manager = TokenManager()
+                            # Reuse the manager's token manager (and its cached
+                            # service app token) to extend the data source token
+                            token_manager = manager.token_manager or TokenManager()
 
-                            # Check if current service app token is valid
-                            if not token_manager.is_token_valid():
+                            # Make sure a valid service app token is available,
+                            # reusing a cached one when possible
+                            try:
+                                token_manager.get_service_app_token()
+                            except Exception as e:
+                                print(f"Failed to get service app token: {e}")
                                 print(
-                                    "\nService app token is invalid or expired. Attempting to refresh..."
+                                    "\nPlease ensure your token configuration is correct."
                                 )
-                                try:
-                                    token_manager.refresh_token()
-                                    print("Service app token refreshed successfully.")
-                                except Exception as e:
-                                    print(f"Failed to refresh service app token: {e}")
-                                    print(
-                                        "\nPlease ensure your token configuration is correct."
-                                    )
-                                    input("Press Enter to continue...")
-                                    break
+                                input("Press Enter to continue...")
+                                break
 
                             extend_result = token_manager.extend_data_source_token(
                                 ds_id, token_lifetime
@@ -853,17 +1233,17 @@ def main():
                                 )
 
                                 # Save operation log
-                                log_filename = f"data_source_extend_{ds_id}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+                                now = datetime.now()
+                                log_filename = f"data_source_extend_{ds_id}_{now.strftime('%Y%m%d_%H%M%S')}.json"
                                 log_data = {
-                                    "operation_timestamp": datetime.now().isoformat(),
+                                    "operation_timestamp": now.isoformat(),
                                     "operation_type": "extend_token",
                                     "data_source_id": ds_id,
                                     "token_lifetime_minutes": token_lifetime,
                                     "result": extend_result,
                                 }
 
-                                with open(log_filename, "w") as f:
-                                    json.dump(log_data, f, indent=2)
+                                write_json_file(log_filename, log_data)
 
                                 print(f"   Operation logged to: {log_filename}")
 
@@ -872,6 +1252,9 @@ def main():
                                 result = manager.list_all_data_sources()
                                 if result["success"]:
                                     data_sources = result["data"].get("items", [])
+                                    enriched_data_sources = enrich_data_sources(
+                                        data_sources
+                                    )
                                     # Find and show the updated data source
                                     for updated_ds in data_sources:
                                         if updated_ds["id"] == ds_id:
@@ -933,12 +1316,16 @@ def main():
                             print(
                                 f"Data Source ID: {reg_result['data'].get('id', 'N/A')}"
                             )
+                            # Refresh the list while the operation record is saved
+                            pending_list = manager.list_all_data_sources_in_background()
                             save_operation_record("registration", config, reg_result)
 
-                            # Refresh the list
-                            result = manager.list_all_data_sources()
+                            result = pending_list.result()
                             if result["success"]:
                                 data_sources = result["data"].get("items", [])
+                                enriched_data_sources = enrich_data_sources(
+                                    data_sources
+                                )
                         else:
                             print("❌ Data Source Registration Failed!")
                             print(
@@ -951,6 +1338,7 @@ def main():
                 continue
             else:
                 # View/update existing data source
+                pending_list = None
                 try:
                     ds_index = int(choice)
                     selected_ds = data_sources[ds_index]
@@ -1000,19 +1388,17 @@ def main():
 
                                     if update_result["success"]:
                                         print("✅ Data Source Update Successful!")
+                                        # Refresh the list in the background; it is
+                                        # collected after the "Press Enter" pause
+                                        pending_list = (
+                                            manager.list_all_data_sources_in_background()
+                                        )
                                         display_data_source_details(
                                             update_result["data"], manager
                                         )
                                         save_operation_record(
                                             "update", update_config, update_result
                                         )
-
-                                        # Refresh the list
-                                        result = manager.list_all_data_sources()
-                                        if result["success"]:
-                                            data_sources = result["data"].get(
-                                                "items", []
-                                            )
                                     else:
                                         print("❌ Data Source Update Failed!")
                                         print(
@@ -1038,12 +1424,21 @@ def main():
 
                 input("\nPress Enter to continue...")
 
+                if pending_list is not None:
+                    result = pending_list.result()
+                    if result["success"]:
+                        data_sources = result["data"].get("items", [])
+                        enriched_data_sources = enrich_data_sources(data_sources)
+
     except KeyboardInterrupt:
         print("\n\nOperation cancelled by user.")
         sys.exit(0)
     except Exception as e:
         print(f"\nUnexpected error: {str(e)}")
         sys.exit(1)
+    finally:
+        if manager is not None:
+            manager.close()
 
 
 if __name__ == "__main__":
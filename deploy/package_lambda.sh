@@ -38,12 +38,21 @@ fi
 
 # Install dependencies to package directory
 pip install --target "$PACKAGE_DIR" \
-    requests \
-    pyjwt \
+    "requests>=2.32.2" \
     boto3 \
     --upgrade \
     --quiet
 
+# orjson ships compiled wheels, so fetch the one matching the Lambda runtime
+# (x86_64 Linux) rather than the machine building the package
+pip install --target "$PACKAGE_DIR" \
+    --platform manylinux2014_x86_64 \
+    --only-binary=:all: \
+    --python-version "$PYTHON_VERSION" \
+    orjson \
+    --upgrade \
+    --quiet
+
 echo "✓ Dependencies installed"
 
 # Copy required Python files
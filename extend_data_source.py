@@ -6,53 +6,138 @@ This script provides a quick way to extend a data source token without changing
 It only updates the nonce to trigger a new token generation.
 
 Usage:
-    python extend_data_source.py <data_source_id> [token_lifetime_minutes]
+    python extend_data_source.py <data_source_id> [<data_source_id> ...] [token_lifetime_minutes]
+    python extend_data_source.py --help
 
 Examples:
     python extend_data_source.py 85895e47-3096-4c47-aae8-f5a52f7b7870
     python extend_data_source.py 85895e47-3096-4c47-aae8-f5a52f7b7870 1440  # 24 hours (maximum)
+    python extend_data_source.py <id1> <id2> <id3>  # several data sources at once
 """
 
+import argparse
+import os
 import sys
-import json
+import logging
 from datetime import datetime
-from token_manager import TokenManager
 
+from token_manager import MAX_TOKEN_LIFETIME_MINUTES, TokenManager, dumps_json
 
-def main():
-    if len(sys.argv) < 2:
-        print(
-            "Usage: python extend_data_source.py <data_source_id> [token_lifetime_minutes]"
+
+# Every extension is appended to this JSON Lines file (one record per line)
+OPERATION_LOG_PATH = "data_source_extend.jsonl"
+
+
+def append_json_line(filepath: str, record) -> None:
+    """Append a record to a JSON Lines file with a single O_APPEND write."""
+    line = dumps_json(record) + b"\n"
+
+    fd = os.open(filepath, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+    try:
+        os.write(fd, line)
+    finally:
+        os.close(fd)
+
+
+def _write_operation_log(log_data: dict) -> bool:
+    """Append the operation log record, reporting (not raising) any failure."""
+    try:
+        append_json_line(OPERATION_LOG_PATH, log_data)
+    except Exception as e:
+        print(f"Warning: Could not write operation log: {e}")
+        return False
+    return True
+
+
+def _token_lifetime_minutes(value: str) -> int:
+    """argparse type: a token lifetime between 1 and MAX_TOKEN_LIFETIME_MINUTES."""
+    try:
+        minutes = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid number of minutes: {value!r}")
+    if minutes <= 0:
+        raise argparse.ArgumentTypeError(
+            f"token lifetime must be positive (requested: {minutes} minutes)"
         )
-        print("\nExample:")
-        print("  python extend_data_source.py 85895e47-3096-4c47-aae8-f5a52f7b7870")
-        print(
-            "  python extend_data_source.py 85895e47-3096-4c47-aae8-f5a52f7b7870 1440  # 24 hours (maximum)"
+    if minutes > MAX_TOKEN_LIFETIME_MINUTES:
+        raise argparse.ArgumentTypeError(
+            f"token lifetime cannot exceed {MAX_TOKEN_LIFETIME_MINUTES} minutes (24 hours) "
+            f"(requested: {minutes} minutes)"
         )
-        sys.exit(1)
+    return minutes
 
-    data_source_id = sys.argv[1]
-    token_lifetime_minutes = (
-        int(sys.argv[2]) if len(sys.argv) > 2 else 1440
-    )  # Default 24 hours (max allowed)
 
-    # Validate token lifetime
-    if token_lifetime_minutes > 1440:
-        print("❌ Error: Token lifetime cannot exceed 1440 minutes (24 hours)")
-        print(f"   Requested: {token_lifetime_minutes} minutes")
-        print("   Maximum allowed: 1440 minutes")
-        sys.exit(1)
+def _report_result(data_source_id: str, token_lifetime_minutes: int, result: dict) -> bool:
+    """Print and log the outcome of one extension. Returns True on success."""
+    if result["success"]:
+        # Save operation log
+        log_data = {
+            "operation_timestamp": datetime.now().isoformat(),
+            "operation_type": "extend_token",
+            "data_source_id": data_source_id,
+            "token_lifetime_minutes": token_lifetime_minutes,
+            "result": result,
+        }
 
-    if token_lifetime_minutes <= 0:
-        print("❌ Error: Token lifetime must be positive")
-        print(f"   Requested: {token_lifetime_minutes} minutes")
-        sys.exit(1)
+        logged = _write_operation_log(log_data)
+
+        # Report the whole result in a single write
+        lines = [
+            f"✅ Data source token extended successfully: {data_source_id}",
+            f"   New nonce: {result['nonce_updated']}",
+            f"   Token expiry: {result['token_expiry']}",
+            f"   Token lifetime: {result['token_lifetime_minutes']} minutes",
+        ]
+        if logged:
+            lines.append(f"   Operation logged to: {OPERATION_LOG_PATH}")
+        print("\n".join(lines))
+        return True
+
+    print(f"❌ Failed to extend data source token: {data_source_id}")
+    print(f"   Error: {result['error']}")
+    if "status_code" in result:
+        print(f"   Status code: {result['status_code']}")
+    return False
+
+
+def main():
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    parser = argparse.ArgumentParser(
+        description="Extend data source tokens by updating only their nonce",
+        usage="%(prog)s [-h] data_source_id [data_source_id ...] [token_lifetime_minutes]",
+        epilog=(
+            "examples:\n"
+            "  python extend_data_source.py 85895e47-3096-4c47-aae8-f5a52f7b7870\n"
+            "  python extend_data_source.py 85895e47-3096-4c47-aae8-f5a52f7b7870 1440  # 24 hours (maximum)\n"
+            "  python extend_data_source.py <id1> <id2> <id3>  # several data sources at once"
+        ),
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument(
+        "data_source_ids",
+        nargs="+",
+        metavar="data_source_id",
+        help=(
+            "ID of a data source to extend; several IDs are extended concurrently. "
+            "A trailing number is read as the token lifetime in minutes, "
+            f"1-{MAX_TOKEN_LIFETIME_MINUTES} (default: {MAX_TOKEN_LIFETIME_MINUTES})"
+        ),
+    )
+    args = parser.parse_args()
+
+    # Data source IDs are UUIDs, so a trailing integer is the token lifetime
+    data_source_ids = args.data_source_ids
+    token_lifetime_minutes = MAX_TOKEN_LIFETIME_MINUTES  # Default 24 hours (max allowed)
+    if len(data_source_ids) > 1 and data_source_ids[-1].lstrip("-").isdigit():
+        try:
+            token_lifetime_minutes = _token_lifetime_minutes(data_source_ids.pop())
+        except argparse.ArgumentTypeError as e:
+            parser.error(f"argument token_lifetime_minutes: {e}")
 
-    print(f"Extending token for data source: {data_source_id}")
     print(
-        f"Token lifetime: {token_lifetime_minutes} minutes ({token_lifetime_minutes / 60:.1f} hours)"
+        f"Extending token for data source(s): {', '.join(data_source_ids)}\n"
+        f"Token lifetime: {token_lifetime_minutes} minutes ({token_lifetime_minutes / 60:.1f} hours)\n"
     )
-    print()
 
     # Initialize token manager
     token_manager = TokenManager()
@@ -68,37 +153,16 @@ def main():
         print("and update it in token-config.json")
         sys.exit(1)
 
-    # Extend the data source token
-    result = token_manager.extend_data_source_token(
-        data_source_id, token_lifetime_minutes
+    # Extend the data source tokens (concurrently when there are several)
+    results = token_manager.extend_data_source_tokens(
+        data_source_ids, token_lifetime_minutes
     )
 
-    if result["success"]:
-        print("✅ Data source token extended successfully!")
-        print(f"   New nonce: {result['nonce_updated']}")
-        print(f"   Token expiry: {result['token_expiry']}")
-        print(f"   Token lifetime: {result['token_lifetime_minutes']} minutes")
-
-        # Save operation log
-        log_filename = f"data_source_extend_{data_source_id}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-        log_data = {
-            "operation_timestamp": datetime.now().isoformat(),
-            "operation_type": "extend_token",
-            "data_source_id": data_source_id,
-            "token_lifetime_minutes": token_lifetime_minutes,
-            "result": result,
-        }
-
-        with open(log_filename, "w") as f:
-            json.dump(log_data, f, indent=2)
-
-        print(f"   Operation logged to: {log_filename}")
-
-    else:
-        print("❌ Failed to extend data source token:")
-        print(f"   Error: {result['error']}")
-        if "status_code" in result:
-            print(f"   Status code: {result['status_code']}")
+    succeeded = [
+        _report_result(data_source_id, token_lifetime_minutes, result)
+        for data_source_id, result in results.items()
+    ]
+    if not all(succeeded):
         sys.exit(1)
 
 
@@ -9,9 +9,12 @@ Usage:
 """
 
 from token_manager import TokenManager
+import logging
 import sys
 
 def main():
+    # Status messages go to stderr so stdout stays just the token
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
     try:
         tm = TokenManager()
         token = tm.get_service_app_token()
@@ -9,6 +9,7 @@ Environment Variables:
     DATA_SOURCE_ID: The ID of the data source to extend
     SECRET_NAME: Name of the AWS Secrets Manager secret containing credentials
     TOKEN_LIFETIME_MINUTES: Token lifetime in minutes (optional, defaults to 1440)
+    LOG_LEVEL: Logging level (optional, defaults to INFO)
 
 Returns:
     dict: Lambda response with statusCode, body, and execution details
@@ -18,11 +19,90 @@ import json
 import os
 import logging
 from datetime import datetime
-from token_manager import TokenManager
+from token_manager import MAX_TOKEN_LIFETIME_MINUTES, TokenManager, dumps_json, preconnect
+
+# Secrets Manager client built once per container, so warm invocations reuse
+# its credentials and connection pool. boto3 ships with the Lambda runtime;
+# without it (local testing) TokenManager falls back to token-config.json.
+try:
+    import boto3
+    from botocore.config import Config
+
+    _secrets_client = boto3.client(
+        'secretsmanager',
+        region_name=os.environ.get('AWS_REGION', 'us-east-1'),
+        config=Config(
+            connect_timeout=5,
+            read_timeout=10,
+            retries={'max_attempts': 3, 'mode': 'standard'}
+        )
+    )
+except ImportError:
+    _secrets_client = None
 
 # Configure logging
 logger = logging.getLogger()
-logger.setLevel(logging.INFO)
+_log_level = os.environ.get('LOG_LEVEL', 'INFO').upper()
+try:
+    logger.setLevel(_log_level)
+except ValueError:
+    # A typo in LOG_LEVEL must not stop the function from loading
+    logger.setLevel(logging.INFO)
+    logger.warning("Invalid LOG_LEVEL %r, falling back to INFO", _log_level)
+
+
+def _read_config():
+    """
+    Read and validate the function configuration from environment variables.
+
+    Returns:
+        tuple: (data_source_id, secret_name, token_lifetime_minutes, error message or None)
+    """
+    data_source_id = os.environ.get('DATA_SOURCE_ID')
+    secret_name = os.environ.get('SECRET_NAME', 'webex-byods-credentials')
+    raw_lifetime = os.environ.get('TOKEN_LIFETIME_MINUTES', str(MAX_TOKEN_LIFETIME_MINUTES))
+
+    if not data_source_id:
+        return data_source_id, secret_name, None, "DATA_SOURCE_ID environment variable is required"
+    try:
+        token_lifetime_minutes = int(raw_lifetime)
+    except ValueError:
+        return data_source_id, secret_name, None, (
+            f"TOKEN_LIFETIME_MINUTES must be a whole number of minutes, got {raw_lifetime!r}"
+        )
+    return data_source_id, secret_name, token_lifetime_minutes, None
+
+
+# Environment variables can't change within a container, so they are read
+# and validated once at cold start
+DATA_SOURCE_ID, SECRET_NAME, TOKEN_LIFETIME_MINUTES, _CONFIG_ERROR = _read_config()
+
+# Open the Webex connection during init so the first invocation reuses it
+# instead of paying for the TCP and TLS handshake
+if not _CONFIG_ERROR:
+    preconnect()
+
+# TokenManager kept at module scope so warm invocations reuse its cached
+# secret and service app token instead of fetching them again
+_token_manager = None
+
+
+def _get_token_manager() -> TokenManager:
+    """Return the TokenManager for this container, creating it on first use."""
+    global _token_manager
+    if _token_manager is None:
+        logger.info("Initializing TokenManager")
+        _token_manager = TokenManager(
+            config_path='token-config.json',  # Fallback for local testing
+            secret_name=SECRET_NAME,
+            secrets_client=_secrets_client
+        )
+    return _token_manager
+
+
+def _to_json(data) -> str:
+    """Serialize data to a JSON string (Lambda response bodies must be str)."""
+    return dumps_json(data).decode()
 
 
 def lambda_handler(event, context):
@@ -37,75 +117,76 @@ def lambda_handler(event, context):
         dict: Response with statusCode and body containing operation result
     """
     logger.info("Starting BYODS token extension Lambda function")
-    logger.info(f"Event: {json.dumps(event)}")
+    now_iso = datetime.now().isoformat()
+    # Only serialize the event when INFO records are actually emitted
+    if logger.isEnabledFor(logging.INFO):
+        logger.info("Event: %s", _to_json(event))
     
-    # Get configuration from environment variables
-    data_source_id = os.environ.get('DATA_SOURCE_ID')
-    secret_name = os.environ.get('SECRET_NAME', 'webex-byods-credentials')
-    token_lifetime_minutes = int(os.environ.get('TOKEN_LIFETIME_MINUTES', '1440'))
-    
-    # Validate required environment variables
-    if not data_source_id:
-        error_msg = "DATA_SOURCE_ID environment variable is required"
-        logger.error(error_msg)
+    # Configuration was read and validated at cold start
+    if _CONFIG_ERROR:
+        logger.error(_CONFIG_ERROR)
         return {
             'statusCode': 400,
-            'body': json.dumps({
+            'body': _to_json({
                 'success': False,
-                'error': error_msg,
-                'timestamp': datetime.now().isoformat()
+                'error': _CONFIG_ERROR,
+                'timestamp': now_iso
             })
         }
+
+    data_source_id = DATA_SOURCE_ID
+    secret_name = SECRET_NAME
+    token_lifetime_minutes = TOKEN_LIFETIME_MINUTES
     
-    logger.info(f"Data Source ID: {data_source_id}")
-    logger.info(f"Secret Name: {secret_name}")
-    logger.info(f"Token Lifetime: {token_lifetime_minutes} minutes")
+    logger.info(
+        "Data Source ID: %s, Secret Name: %s, Token Lifetime: %s minutes",
+        data_source_id, secret_name, token_lifetime_minutes
+    )
     
     try:
-        # Initialize TokenManager with AWS Secrets Manager support
-        logger.info("Initializing TokenManager")
-        token_manager = TokenManager(
-            config_path='token-config.json',  # Fallback for local testing
-            secret_name=secret_name
-        )
+        # TokenManager with AWS Secrets Manager support (reused when warm)
+        token_manager = _get_token_manager()
         
         # Extend the data source token
-        logger.info(f"Extending token for data source: {data_source_id}")
+        logger.info("Extending token for data source: %s", data_source_id)
         result = token_manager.extend_data_source_token(
             data_source_id, 
             token_lifetime_minutes
         )
         
         if result['success']:
-            logger.info("Data source token extended successfully")
-            logger.info(f"New nonce: {result.get('nonce_updated')}")
-            logger.info(f"Token expiry: {result.get('token_expiry')}")
-            logger.info(f"Token lifetime: {result.get('token_lifetime_minutes')} minutes")
+            logger.info(
+                "Data source token extended successfully "
+                "(nonce: %s, expiry: %s, lifetime: %s minutes)",
+                result.get('nonce_updated'),
+                result.get('token_expiry'),
+                result.get('token_lifetime_minutes'),
+            )
             
             return {
                 'statusCode': 200,
-                'body': json.dumps({
+                'body': _to_json({
                     'success': True,
                     'message': 'Data source token extended successfully',
                     'data_source_id': data_source_id,
                     'nonce_updated': result.get('nonce_updated'),
                     'token_expiry': result.get('token_expiry'),
                     'token_lifetime_minutes': result.get('token_lifetime_minutes'),
-                    'timestamp': datetime.now().isoformat()
+                    'timestamp': now_iso
                 })
             }
         else:
             error_msg = result.get('error', 'Unknown error')
             status_code = result.get('status_code', 500)
-            logger.error(f"Failed to extend data source token: {error_msg}")
+            logger.error("Failed to extend data source token: %s", error_msg)
             
             return {
                 'statusCode': status_code,
-                'body': json.dumps({
+                'body': _to_json({
                     'success': False,
                     'error': error_msg,
                     'data_source_id': data_source_id,
-                    'timestamp': datetime.now().isoformat()
+                    'timestamp': now_iso
                 })
             }
             
@@ -114,10 +195,10 @@ def lambda_handler(event, context):
         logger.error(error_msg, exc_info=True)
         return {
             'statusCode': 500,
-            'body': json.dumps({
+            'body': _to_json({
                 'success': False,
                 'error': error_msg,
-                'timestamp': datetime.now().isoformat()
+                'timestamp': now_iso
             })
         }
 
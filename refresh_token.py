@@ -3,17 +3,33 @@
 Script to manually refresh Webex service app tokens.
 """
 
+import logging
 import sys
-from token_manager import TokenManager
+from token_manager import PersonalTokenError, TokenManager
+
+# Shown when the personal access token was rejected and could not be refreshed
+REFRESH_GUIDANCE = "\n".join(
+    [
+        "",
+        "=" * 60,
+        "Your personal access token could not be used or refreshed.",
+        "Run setup_oauth.py to re-authorize, or get a fresh personal",
+        "access token from developer.webex.com and update it in",
+        "token-config.json",
+        "=" * 60,
+    ]
+)
 
 
 def main():
     """Main function to refresh the token."""
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
     token_manager = TokenManager()
 
     try:
+        # A token cached on disk by an earlier run may still be usable
         print("Checking current token validity...")
-        if token_manager.is_token_valid():
+        if token_manager.load_cached_token():
             print("Current token is still valid.")
             response = input("Do you want to refresh it anyway? (y/N): ")
             if response.lower() not in ["y", "yes"]:
@@ -25,20 +41,12 @@ def main():
         print("Token refreshed successfully!")
         print(f"New token starts with: {new_token[:20]}...")
 
-        # Show which refresh method was used
-        if token_manager._get_current_refresh_token():
-            print(
-                "Note: Future refreshes will use the stored refresh token for better efficiency."
-            )
-
     except Exception as e:
         print(f"Token refresh failed: {e}")
 
         # Provide guidance on how to fix token issues
-        if "Authentication failed" in str(e) or "401" in str(e):
-            print("\n" + "=" * 60)
-            print(token_manager.get_token_refresh_guidance())
-            print("=" * 60)
+        if isinstance(e, PersonalTokenError):
+            print(REFRESH_GUIDANCE)
 
         sys.exit(1)
 
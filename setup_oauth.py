@@ -6,18 +6,209 @@ This script helps you set up OAuth authorization for your token manager integrat
 Use this when you want to enable automatic refresh of your personal access token.
 """
 
+import enum
+import http.server
 import json
+import os
+import queue
+import re
+import tempfile
+import threading
+import time
 import urllib.parse
 import webbrowser
-from typing import Dict
+from typing import Dict, NamedTuple, Optional
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from token_manager import ACCESS_TOKEN_URL, loads_json, refresh_personal_token_oauth
+
+# (connect, read) timeouts for Webex API calls, in seconds
+REQUEST_TIMEOUT = (3.05, 10)
+
+# Shared keep-alive session so repeated token calls reuse one connection.
+# Connection failures are retried with backoff. Status-based retries only
+# apply to idempotent methods, so the single-use authorization code
+# exchange is never sent twice.
+_SESSION = requests.Session()
+_SESSION.mount(
+    "https://",
+    HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=16,
+        max_retries=Retry(
+            total=3, backoff_factor=0.2, status_forcelist=[429, 500, 502, 503, 504]
+        ),
+    ),
+)
+_SESSION.headers.update({"User-Agent": "webex-byods-manager/setup_oauth"})
+
+CONFIG_PATH = "token-config.json"
+
+# Parsed config and the (mtime_ns, size) of the file it was read from
+_config_cache = None
+_config_signature = None
+
+# Anything shorter can't be a Webex access token
+MIN_TOKEN_LENGTH = 40
+
+# Attempts and initial backoff when validating a pasted token hits a
+# transient error (429/5xx/network)
+VALIDATION_ATTEMPTS = 3
+VALIDATION_RETRY_BACKOFF_SECONDS = 0.5
+
+# Token Manager endpoint used to validate a personal/integration token
+_SERVICE_APP_TOKEN_URL = "https://webexapis.com/v1/applications/{app_id}/token"
+
+# Use localhost as redirect URI
+REDIRECT_URI = "http://localhost:3000/callback"
+
+# Authorization URL with every query parameter except client_id pre-encoded
+_AUTH_URL_TEMPLATE = (
+    "https://webexapis.com/v1/authorize?client_id={client_id}&"
+    + urllib.parse.urlencode(
+        {
+            "response_type": "code",
+            "redirect_uri": REDIRECT_URI,
+            "scope": "spark:applications_token",
+            "state": "token_manager_setup",
+        }
+    )
+)
+
+# Pulls the code out of a pasted redirect URL (a bare code is used as-is)
+_CODE_RE = re.compile(r"[?&]code=([^&\s#]+)")
+
+# tokenManager keys needed for a new OAuth flow, and for refreshing a token
+_OAUTH_CLIENT_KEYS = frozenset(("clientId", "clientSecret"))
+_OAUTH_REFRESH_KEYS = _OAUTH_CLIENT_KEYS | {"refreshToken"}
+
+# Menu choices in prompt_for_credential_method, and how many invalid
+# answers to accept before giving up
+_CREDENTIAL_METHODS = {"1": "pat", "2": "oauth"}
+MAX_CHOICE_ATTEMPTS = 5
+
+# How long to wait for the browser to hit the local callback server
+CALLBACK_TIMEOUT_SECONDS = 180
+
+
+class _OAuthCallbackHandler(http.server.BaseHTTPRequestHandler):
+    """Captures the authorization code from the OAuth redirect to localhost."""
+
+    def do_GET(self):
+        parsed = urllib.parse.urlparse(self.path)
+        if parsed.path != urllib.parse.urlparse(REDIRECT_URI).path:
+            self.send_error(404)
+            return
+
+        params = urllib.parse.parse_qs(parsed.query)
+        code = params.get("code", [None])[0]
+        state = params.get("state", [None])[0]
+
+        if code and state == "token_manager_setup":
+            self.server.result_queue.put(code)
+            self.send_response(200)
+            message = "Authorization received. You can close this window and return to the terminal."
+        else:
+            # Denied or malformed redirect: stop waiting and fall back to manual entry
+            self.server.result_queue.put(None)
+            self.send_response(400)
+            error = params.get("error_description", params.get("error", ["no authorization code"]))[0]
+            message = f"Authorization failed: {error}"
+
+        body = message.encode("utf-8")
+        self.send_header("Content-Type", "text/plain; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        """Keep request logging out of the interactive prompt."""
+
+
+def start_callback_server():
+    """
+    Start a local server on the redirect URI's port to receive the OAuth redirect.
+
+    Returns:
+        The running HTTPServer, or None if the port is unavailable
+    """
+    redirect = urllib.parse.urlparse(REDIRECT_URI)
+    try:
+        httpd = http.server.HTTPServer(
+            (redirect.hostname, redirect.port), _OAuthCallbackHandler
+        )
+    except OSError:
+        return None
+
+    httpd.result_queue = queue.Queue()
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    return httpd
+
+
+def wait_for_callback_code(httpd) -> str:
+    """
+    Wait for the callback server to receive an authorization code, then stop it.
+
+    Returns:
+        str: The authorization code, or "" if none arrived (timeout, denial or Ctrl+C)
+    """
+    print(
+        f"Waiting for the browser redirect (up to {CALLBACK_TIMEOUT_SECONDS // 60} minutes, "
+        "Ctrl+C to enter the code manually)..."
+    )
+    try:
+        return httpd.result_queue.get(timeout=CALLBACK_TIMEOUT_SECONDS) or ""
+    except queue.Empty:
+        print("Timed out waiting for the browser redirect.")
+    except KeyboardInterrupt:
+        print()
+    finally:
+        httpd.shutdown()
+        httpd.server_close()
+    return ""
+
+
+def preconnect_in_background() -> None:
+    """
+    Open the session's connection to webexapis.com on a background thread.
+
+    Called before waiting on the user so the TLS handshake overlaps their
+    think time and the next API call reuses the pooled connection.
+    """
+
+    def _warm_up():
+        try:
+            _SESSION.head("https://webexapis.com/v1/", timeout=REQUEST_TIMEOUT)
+        except requests.RequestException:
+            pass
+
+    threading.Thread(target=_warm_up, daemon=True).start()
+
+
+def _config_file_signature():
+    """Return (mtime_ns, size) of token-config.json, used to spot changes on disk."""
+    st = os.stat(CONFIG_PATH)
+    return st.st_mtime_ns, st.st_size
 
 
 def load_config() -> Dict:
-    """Load the token configuration."""
+    """
+    Load the token configuration.
+
+    The parsed config is cached and re-read only when the file's mtime or
+    size changes. The cached dict is shared, so callers that modify it
+    should persist the change with save_config().
+    """
+    global _config_cache, _config_signature
     try:
-        with open("token-config.json", "r") as f:
-            return json.load(f)
+        signature = _config_file_signature()
+        if _config_cache is not None and signature == _config_signature:
+            return _config_cache
+        with open(CONFIG_PATH, "rb") as f:
+            _config_cache = loads_json(f.read())
+        _config_signature = signature
+        return _config_cache
     except FileNotFoundError:
         print(
             "Error: token-config.json not found. Please create it from the template first."
@@ -29,101 +220,128 @@ def load_config() -> Dict:
 
 
 def save_config(config: Dict) -> None:
-    """Save the updated configuration."""
-    with open("token-config.json", "w") as f:
-        json.dump(config, f, indent=4)
-
-
-def is_token_manager_token_valid(token: str, service_app_config: Dict) -> bool:
+    """Save the updated configuration atomically (temp file + rename)."""
+    temp_file = tempfile.NamedTemporaryFile(
+        mode="w", delete=False, dir=".", prefix=".token-config-", suffix=".tmp"
+    )
+    try:
+        json.dump(config, temp_file, indent=4)
+        temp_file.flush()
+        os.fsync(temp_file.fileno())
+        temp_file.close()
+        os.replace(temp_file.name, CONFIG_PATH)
+    except BaseException:
+        # Also on Ctrl+C: never leave a half-written temp file behind
+        temp_file.close()
+        try:
+            os.unlink(temp_file.name)
+        except OSError:
+            pass
+        raise
+
+    # The file now matches this dict, so keep serving it from the cache
+    global _config_cache, _config_signature
+    _config_cache = config
+    _config_signature = _config_file_signature()
+
+
+class TokenStatus(enum.Enum):
+    """Outcome of probing a Token Manager integration token."""
+
+    VALID = "valid"  # 200: the token can fetch service app tokens
+    INVALID = "invalid"  # 4xx: expired, revoked or lacking scope; refresh it
+    TRANSIENT = "transient"  # 429/5xx or network error: try again later
+
+
+def check_token_manager_token(token: str, service_app_config: Dict) -> TokenStatus:
     """
-    Check if a Token Manager integration token is valid by using it
-    to fetch a service app token.
+    Check a Token Manager integration token by using it to fetch a
+    service app token, and classify the result.
 
     Args:
         token: The Token Manager integration token to validate
         service_app_config: The serviceApp section from config
 
     Returns:
-        bool: True if valid, False otherwise
+        TokenStatus: VALID, INVALID or TRANSIENT
     """
+    # Webex tokens are long opaque strings; a short paste or one with
+    # embedded whitespace can't be valid, so skip the round trip
+    if len(token) < MIN_TOKEN_LENGTH or any(c.isspace() for c in token):
+        return TokenStatus.INVALID
+
     try:
-        url = f"https://webexapis.com/v1/applications/{service_app_config['appId']}/token"
-        headers = {
-            "Authorization": f"Bearer {token}",
-            "Content-Type": "application/json",
-        }
+        url = _SERVICE_APP_TOKEN_URL.format(app_id=service_app_config["appId"])
+        # Content-Type comes from json=, User-Agent from the session
+        headers = {"Authorization": f"Bearer {token}"}
         payload = {
             "clientId": service_app_config["clientId"],
             "clientSecret": service_app_config["clientSecret"],
             "targetOrgId": service_app_config["targetOrgId"],
         }
 
-        response = requests.post(url, headers=headers, json=payload)
-
-        # 200 = valid token, 401 = invalid/expired token
-        return response.status_code == 200
-    except Exception:
-        return False
-
-
-def refresh_personal_token_oauth(token_config: Dict) -> str:
+        response = _SESSION.post(
+            url, headers=headers, json=payload, timeout=REQUEST_TIMEOUT
+        )
+    except KeyError:
+        # serviceApp config missing a field: the token can't be used as configured
+        return TokenStatus.INVALID
+    except requests.RequestException:
+        return TokenStatus.TRANSIENT
+
+    if response.status_code == 200:
+        return TokenStatus.VALID
+    if response.status_code == 429 or response.status_code >= 500:
+        return TokenStatus.TRANSIENT
+    return TokenStatus.INVALID
+
+
+def check_token_manager_token_with_retry(
+    token: str, service_app_config: Dict
+) -> TokenStatus:
     """
-    Refresh the personal access token using OAuth.
-
-    Args:
-        token_config: Configuration dictionary containing clientId, clientSecret, and refreshToken
+    Check a token like check_token_manager_token(), retrying transient
+    failures with exponential backoff. VALID and INVALID return at once.
 
     Returns:
-        str: New personal access token
-
-    Raises:
-        Exception: If refresh fails
+        TokenStatus: The first non-transient status, or TRANSIENT if every attempt failed
     """
-    url = "https://webexapis.com/v1/access_token"
-    headers = {"Content-Type": "application/x-www-form-urlencoded"}
-    data = {
-        "grant_type": "refresh_token",
-        "client_id": token_config["clientId"],
-        "client_secret": token_config["clientSecret"],
-        "refresh_token": token_config["refreshToken"],
-    }
-
-    response = requests.post(url, headers=headers, data=data)
-
-    if response.status_code == 401:
-        raise Exception(
-            "OAuth refresh token expired. Please re-authorize your integration."
-        )
-
-    response.raise_for_status()
-
-    token_data = response.json()
-    new_access_token = token_data.get("access_token")
+    delay = VALIDATION_RETRY_BACKOFF_SECONDS
+    for attempt in range(VALIDATION_ATTEMPTS):
+        status = check_token_manager_token(token, service_app_config)
+        if status is not TokenStatus.TRANSIENT:
+            return status
+        if attempt < VALIDATION_ATTEMPTS - 1:
+            time.sleep(delay)
+            delay *= 2
+    return status
 
-    if not new_access_token:
-        raise Exception("No access token in OAuth refresh response")
 
-    return new_access_token
+class OAuthCapabilities(NamedTuple):
+    """Which OAuth operations the tokenManager config supports."""
 
+    client: bool  # clientId + clientSecret: can run a new authorization flow
+    refresh: bool  # ...plus refreshToken: can refresh the personal token
 
-def can_refresh_oauth(config: Dict) -> bool:
-    """Check if OAuth refresh credentials exist."""
-    return all(k in config for k in ["clientId", "clientSecret", "refreshToken"])
 
-
-def has_oauth_credentials(config: Dict) -> bool:
-    """Check if OAuth client credentials exist (without refresh token)."""
-    return all(k in config for k in ["clientId", "clientSecret"])
+def oauth_capabilities(config: Dict) -> OAuthCapabilities:
+    """Check which OAuth credentials exist in the tokenManager config."""
+    keys = config.keys()
+    return OAuthCapabilities(
+        client=_OAUTH_CLIENT_KEYS <= keys, refresh=_OAUTH_REFRESH_KEYS <= keys
+    )
 
 
-def try_refresh_token(token_config: Dict, full_config: Dict, service_app_config: Dict) -> bool:
+def try_refresh_token(token_config: Dict, full_config: Dict) -> bool:
     """
     Attempt to refresh using OAuth refresh token.
+
+    The refreshed token is saved without a separate validation call: it is
+    issued for the same integration and scope as the one it replaces.
     
     Args:
         token_config: The tokenManager section of the config
         full_config: The complete config dictionary
-        service_app_config: The serviceApp section for validation
         
     Returns:
         bool: True if refresh succeeded, False otherwise
@@ -132,13 +350,6 @@ def try_refresh_token(token_config: Dict, full_config: Dict, service_app_config:
         print("Attempting to refresh token using OAuth...")
         new_token = refresh_personal_token_oauth(token_config)
         
-        # Validate the new token if we have service app config
-        if service_app_config.get("appId"):
-            print("Validating refreshed token...")
-            if not is_token_manager_token_valid(new_token, service_app_config):
-                print("✗ Refreshed token is not valid for Token Manager API")
-                return False
-        
         full_config["tokenManager"]["personalAccessToken"] = new_token
         save_config(full_config)
         print("✓ Token refreshed successfully!")
@@ -149,12 +360,12 @@ def try_refresh_token(token_config: Dict, full_config: Dict, service_app_config:
         return False
 
 
-def prompt_for_credential_method() -> str:
+def prompt_for_credential_method() -> Optional[str]:
     """
     Ask user to choose between PAT or OAuth flow.
     
     Returns:
-        str: "pat" or "oauth"
+        str: "pat" or "oauth", or None after repeated invalid input or end of input
     """
     print()
     print("=" * 60)
@@ -170,14 +381,16 @@ def prompt_for_credential_method() -> str:
     print("     (Recommended: enables automatic token renewal)")
     print()
     
-    while True:
-        choice = input("Enter your choice (1 or 2): ").strip()
-        if choice == "1":
-            return "pat"
-        elif choice == "2":
-            return "oauth"
-        else:
-            print("Invalid choice. Please enter 1 or 2.")
+    for _ in range(MAX_CHOICE_ATTEMPTS):
+        try:
+            choice = input("Enter your choice (1 or 2): ").strip()
+        except EOFError:
+            return None
+        method = _CREDENTIAL_METHODS.get(choice)
+        if method:
+            return method
+        print("Invalid choice. Please enter 1 or 2.")
+    return None
 
 
 def handle_pat_input(config: Dict) -> None:
@@ -197,6 +410,7 @@ def handle_pat_input(config: Dict) -> None:
     print("3. Copy your Personal Access Token")
     print()
     
+    preconnect_in_background()
     pat = input("Paste your Personal Access Token: ").strip()
     if not pat:
         print("✗ No token provided. Setup cancelled.")
@@ -209,11 +423,17 @@ def handle_pat_input(config: Dict) -> None:
     if not service_app_config.get("appId"):
         print("⚠️  Warning: Cannot validate token - serviceApp config missing.")
         print("   Token will be saved but may not work correctly.")
-    elif not is_token_manager_token_valid(pat, service_app_config):
-        print("✗ Invalid token or token doesn't have required permissions.")
-        print("  Make sure this is a Token Manager Integration token with")
-        print("  'spark:applications_token' scope.")
-        return
+    else:
+        status = check_token_manager_token_with_retry(pat, service_app_config)
+        if status is TokenStatus.INVALID:
+            print("✗ Invalid token or token doesn't have required permissions.")
+            print("  Make sure this is a Token Manager Integration token with")
+            print("  'spark:applications_token' scope.")
+            return
+        if status is TokenStatus.TRANSIENT:
+            # Don't make the user paste the token again because Webex hiccuped
+            print("⚠️  Warning: Cannot validate token - Webex is not responding.")
+            print("   Token will be saved but may not work correctly.")
     
     # Save to config
     if "tokenManager" not in config:
@@ -252,29 +472,25 @@ def do_oauth_flow_with_credentials(client_id: str, client_secret: str, config: D
         client_secret: OAuth client secret
         config: The configuration dictionary
     """
-    # Use localhost as redirect URI
-    redirect_uri = "http://localhost:3000/callback"
-
-    # Build authorization URL
-    auth_params = {
-        "client_id": client_id,
-        "response_type": "code",
-        "redirect_uri": redirect_uri,
-        "scope": "spark:applications_token",
-        "state": "token_manager_setup",
-    }
-
-    auth_url = "https://webexapis.com/v1/authorize?" + urllib.parse.urlencode(
-        auth_params
+    redirect_uri = REDIRECT_URI
+    auth_url = _AUTH_URL_TEMPLATE.format(
+        client_id=urllib.parse.quote_plus(client_id)
     )
 
+    # Listen for the redirect before the browser can send it
+    httpd = start_callback_server()
+    preconnect_in_background()
+
     print()
     print("OAuth Authorization Setup")
     print("-" * 40)
     print("1. Opening authorization URL in your browser...")
     print("2. Log in and authorize the application")
-    print("3. You'll be redirected to localhost (which will fail)")
-    print("4. Copy the 'code' parameter from the URL")
+    if httpd:
+        print("3. You'll be redirected to localhost and the code is captured automatically")
+    else:
+        print("3. You'll be redirected to localhost (which will fail)")
+        print("4. Copy the 'code' parameter (or the whole URL) from the address bar")
     print()
     print(f"Authorization URL: {auth_url}")
     print()
@@ -285,11 +501,21 @@ def do_oauth_flow_with_credentials(client_id: str, client_secret: str, config: D
     except Exception:
         print("Could not open browser automatically. Please copy the URL above.")
 
-    print("After authorization, you'll see a URL like:")
-    print("http://localhost:3000/callback?code=ABC123...&state=token_manager_setup")
-    print()
+    auth_code = wait_for_callback_code(httpd) if httpd else ""
 
-    auth_code = input("Enter the authorization code from the URL: ").strip()
+    if auth_code:
+        print("✓ Authorization code received from the browser redirect.")
+    else:
+        print("After authorization, you'll see a URL like:")
+        print("http://localhost:3000/callback?code=ABC123...&state=token_manager_setup")
+        print()
+
+        auth_code = input(
+            "Enter the authorization code (or paste the full redirect URL): "
+        ).strip()
+        match = _CODE_RE.search(auth_code)
+        if match:
+            auth_code = urllib.parse.unquote(match.group(1))
     if not auth_code:
         print("✗ Authorization code is required. Setup cancelled.")
         return
@@ -297,7 +523,6 @@ def do_oauth_flow_with_credentials(client_id: str, client_secret: str, config: D
     # Exchange code for tokens
     print("Exchanging authorization code for tokens...")
 
-    token_url = "https://webexapis.com/v1/access_token"
     token_data = {
         "grant_type": "authorization_code",
         "client_id": client_id,
@@ -307,10 +532,10 @@ def do_oauth_flow_with_credentials(client_id: str, client_secret: str, config: D
     }
 
     try:
-        response = requests.post(token_url, data=token_data)
+        response = _SESSION.post(ACCESS_TOKEN_URL, data=token_data, timeout=REQUEST_TIMEOUT)
         response.raise_for_status()
 
-        tokens = response.json()
+        tokens = loads_json(response.content)
         access_token = tokens.get("access_token")
         refresh_token = tokens.get("refresh_token")
 
@@ -402,26 +627,33 @@ def smart_setup_oauth_flow():
 
     # Step 1: Check if PAT exists and is valid
     personal_token = token_manager_config.get("personalAccessToken")
+    capabilities = oauth_capabilities(token_manager_config)
     if personal_token and service_app_config.get("appId"):
         print("Checking existing personal access token...")
-        if is_token_manager_token_valid(personal_token, service_app_config):
+        status = check_token_manager_token(personal_token, service_app_config)
+        if status is TokenStatus.VALID:
             print("✓ Existing personal access token is valid!")
             print(f"  Token: {personal_token[:20]}...")
             print()
             print("No further setup needed. Your token is ready to use.")
             return
+        if status is TokenStatus.TRANSIENT:
+            # Webex is unreachable or overloaded: refreshing or re-authorizing
+            # would fail the same way, so stop instead of running the cascade
+            print("✗ Could not reach Webex to check the token. Please try again later.")
+            return
         
         print("✗ Existing token is expired or invalid.")
 
     # Step 2: Try OAuth refresh if available
-    if can_refresh_oauth(token_manager_config):
-        if try_refresh_token(token_manager_config, config, service_app_config):
+    if capabilities.refresh:
+        if try_refresh_token(token_manager_config, config):
             print()
             print("No further setup needed. Your token has been refreshed.")
             return
 
     # Step 3: Try OAuth flow with existing credentials
-    if has_oauth_credentials(token_manager_config):
+    if capabilities.client:
         if confirm_use_existing_credentials():
             do_oauth_flow_with_credentials(
                 token_manager_config["clientId"],
@@ -436,8 +668,10 @@ def smart_setup_oauth_flow():
     choice = prompt_for_credential_method()
     if choice == "pat":
         handle_pat_input(config)
-    else:
+    elif choice == "oauth":
         handle_oauth_credential_input(config)
+    else:
+        print("✗ No valid choice made. Setup cancelled.")
 
 
 def main():
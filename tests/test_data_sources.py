@@ -0,0 +1,243 @@
+"""Unit tests for the data sources list cache, conditional refresh, token refresh and operation records."""
+
+import importlib.util
+import json
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+import requests
+
+# data-sources.py has a hyphen in its name, so it can't be imported normally
+_spec = importlib.util.spec_from_file_location(
+    "data_sources",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data-sources.py"),
+)
+data_sources = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(data_sources)
+
+LIST = {"items": [{"id": "ds-1", "url": "https://example.com/data"}]}
+# A cache file in the old untagged format: just the list itself
+LIST_JSON = json.dumps(LIST).encode("utf-8")
+
+
+class ListCacheTests(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmpdir)
+
+        patches = [
+            mock.patch.object(
+                data_sources.WebexDataSourceManager,
+                "LIST_CACHE_PATH",
+                os.path.join(self.tmpdir, "list.json"),
+            ),
+            # No token-config.json is needed: token refresh is not under test
+            mock.patch.object(data_sources, "TokenManager", side_effect=Exception),
+            mock.patch("builtins.print"),
+        ]
+        for patcher in patches:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def make_manager(self, token="token-a"):
+        manager = data_sources.WebexDataSourceManager(token)
+        self.addCleanup(manager.close)
+        return manager
+
+    def test_cached_list_is_served_without_a_request(self):
+        self.make_manager()._write_list_cache(LIST)
+        manager = self.make_manager()
+
+        with mock.patch.object(manager, "_make_request") as make_request:
+            result = manager.list_all_data_sources(use_cache=True)
+        make_request.assert_not_called()
+        self.assertEqual(result["data"], LIST)
+
+    def test_cache_is_bypassed_by_default(self):
+        self.make_manager()._write_list_cache(LIST)
+        manager = self.make_manager()
+
+        with mock.patch.object(
+            manager,
+            "_make_request",
+            return_value={"success": True, "data": {"items": []}, "status_code": 200},
+        ) as make_request:
+            result = manager.list_all_data_sources()
+        make_request.assert_called_once()
+        self.assertEqual(result["data"], {"items": []})
+        self.assertEqual(manager._read_list_cache(), {"items": []})
+
+    def test_expired_cache_is_ignored(self):
+        manager = self.make_manager()
+        manager._write_list_cache(LIST)
+        past = time.time() - manager.LIST_CACHE_TTL_SECONDS - 1
+        os.utime(manager.LIST_CACHE_PATH, (past, past))
+        self.assertIsNone(manager._read_list_cache())
+
+    def test_cache_from_another_token_is_ignored(self):
+        self.make_manager("token-a")._write_list_cache(LIST)
+        self.assertIsNone(self.make_manager("token-b")._read_list_cache())
+
+    def test_cache_from_another_api_is_ignored(self):
+        self.make_manager()._write_list_cache(LIST)
+        with mock.patch.object(
+            data_sources.WebexDataSourceManager, "BASE_URL", "https://example.com/v1"
+        ):
+            self.assertIsNone(self.make_manager()._read_list_cache())
+
+    def test_corrupt_cache_is_ignored(self):
+        manager = self.make_manager()
+        for content in (b"{not json", b"[]", b'{"key": "x"}', LIST_JSON):
+            with self.subTest(content=content):
+                with open(manager.LIST_CACHE_PATH, "wb") as f:
+                    f.write(content)
+                self.assertIsNone(manager._read_list_cache())
+
+    def test_first_request_is_unconditional(self):
+        manager = self.make_manager()
+        with mock.patch.object(
+            manager,
+            "_make_request",
+            return_value={"success": True, "data": LIST, "status_code": 200, "etag": None},
+        ) as make_request:
+            manager.list_all_data_sources()
+        self.assertEqual(make_request.call_args.kwargs["headers"], {})
+
+    def test_unchanged_list_is_revalidated_with_etag(self):
+        manager = self.make_manager()
+        responses = [
+            {"success": True, "data": LIST, "status_code": 200, "etag": '"v1"'},
+            {"success": False, "error": "", "status_code": 304},
+        ]
+        with mock.patch.object(manager, "_make_request", side_effect=responses) as make_request:
+            manager.list_all_data_sources()
+            result = manager.list_all_data_sources()
+
+        self.assertEqual(make_request.call_args.kwargs["headers"], {"If-None-Match": '"v1"'})
+        self.assertEqual(result, {"success": True, "data": LIST, "status_code": 304})
+
+    def test_changed_list_replaces_the_etag(self):
+        manager = self.make_manager()
+        changed = {"items": []}
+        responses = [
+            {"success": True, "data": LIST, "status_code": 200, "etag": '"v1"'},
+            {"success": True, "data": changed, "status_code": 200, "etag": '"v2"'},
+            {"success": False, "error": "", "status_code": 304},
+        ]
+        with mock.patch.object(manager, "_make_request", side_effect=responses) as make_request:
+            manager.list_all_data_sources()
+            manager.list_all_data_sources()
+            result = manager.list_all_data_sources()
+
+        self.assertEqual(make_request.call_args.kwargs["headers"], {"If-None-Match": '"v2"'})
+        self.assertEqual(result["data"], changed)
+
+    def test_successful_change_drops_the_cache(self):
+        manager = self.make_manager()
+        ok = {"success": True, "data": {"id": "ds-1"}, "status_code": 200}
+        for change in (
+            lambda: manager.register_data_source({}),
+            lambda: manager.update_data_source("ds-1", {}),
+        ):
+            with self.subTest(change=change):
+                manager._write_list_cache(LIST)
+                with mock.patch.object(manager, "_make_request", return_value=ok):
+                    change()
+                self.assertFalse(os.path.exists(manager.LIST_CACHE_PATH))
+
+    def test_failed_change_keeps_the_cache(self):
+        manager = self.make_manager()
+        manager._write_list_cache(LIST)
+        failed = {"success": False, "error": "bad", "status_code": 400}
+        with mock.patch.object(manager, "_make_request", return_value=failed):
+            manager.update_data_source("ds-1", {})
+        self.assertEqual(manager._read_list_cache(), LIST)
+
+
+class TokenRefreshTests(unittest.TestCase):
+    def setUp(self):
+        patches = [
+            mock.patch.object(data_sources, "TokenManager"),
+            mock.patch("builtins.print"),
+        ]
+        for patcher in patches:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+        self.manager = data_sources.WebexDataSourceManager("token-a")
+        self.addCleanup(self.manager.close)
+        self.refreshes = 0
+
+        def refresh_token(stale_token=None):
+            self.refreshes += 1
+            time.sleep(0.05)
+            return "token-b"
+
+        self.token_manager = self.manager.token_manager
+        self.token_manager.refresh_token.side_effect = refresh_token
+
+    def fake_request(self, method, url, **kwargs):
+        """Reject token-a with 401; accept any other token."""
+        sent = self.manager.session.headers["Authorization"]
+        response = requests.Response()
+        response.status_code = 401 if sent == "Bearer token-a" else 200
+        response._content = b'{"id": "ds"}'
+        response.request = mock.Mock(headers={"Authorization": sent})
+        return response
+
+    def test_concurrent_401s_refresh_the_token_once(self):
+        with mock.patch.object(self.manager.session, "request", side_effect=self.fake_request):
+            results = self.manager.get_many_details([f"ds-{i}" for i in range(8)])
+
+        self.assertTrue(all(result["success"] for result in results))
+        self.assertEqual(self.refreshes, 1)
+        self.token_manager.refresh_token.assert_called_once_with(stale_token="token-a")
+        self.assertEqual(self.manager.session.headers["Authorization"], "Bearer token-b")
+
+    def test_failed_refresh_returns_the_401(self):
+        self.token_manager.refresh_token.side_effect = Exception("no refresh token")
+        with mock.patch.object(self.manager.session, "request", side_effect=self.fake_request):
+            result = self.manager.get_data_source_details("ds-1")
+
+        self.assertFalse(result["success"])
+        self.assertEqual(result["status_code"], 401)
+
+
+class OperationRecordTests(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmpdir)
+        patcher = mock.patch.object(data_sources, "_SCRIPT_DIR", self.tmpdir)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_outcome_is_printed_by_the_menu_loop_not_the_writer(self):
+        result = {"success": True, "data": {"id": "ds-1"}}
+        with mock.patch("builtins.print") as print_mock:
+            filepath = data_sources.save_operation_record("update", {}, result)
+            data_sources._pending_record_writes[-1].result()
+            print_mock.assert_not_called()
+
+            data_sources.report_operation_records()
+
+        self.assertTrue(os.path.exists(filepath))
+        print_mock.assert_called_once_with(
+            f"📄 Operation record saved to: {os.path.basename(filepath)}"
+        )
+        self.assertEqual(data_sources._pending_record_writes, [])
+
+    def test_failed_write_is_reported_as_a_warning(self):
+        with mock.patch.object(data_sources, "write_json_file", side_effect=OSError("disk full")):
+            data_sources.save_operation_record("update", {}, {"success": False})
+            with mock.patch("builtins.print") as print_mock:
+                data_sources.report_operation_records()
+
+        self.assertIn("disk full", print_mock.call_args.args[0])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,79 @@
+"""Unit tests for extend_data_source.py's command line handling."""
+
+import sys
+import unittest
+from unittest import mock
+
+import extend_data_source
+
+SUCCESS = {
+    "success": True,
+    "nonce_updated": "nonce",
+    "token_expiry": "later",
+    "token_lifetime_minutes": 60,
+}
+
+
+class MainTests(unittest.TestCase):
+    def setUp(self):
+        patches = [
+            mock.patch.object(extend_data_source, "TokenManager"),
+            mock.patch.object(extend_data_source, "append_json_line"),
+            mock.patch("builtins.print"),
+        ]
+        mocks = [patcher.start() for patcher in patches]
+        for patcher in patches:
+            self.addCleanup(patcher.stop)
+        self.manager = mocks[0].return_value
+        self.append_json_line = mocks[1]
+        self.print = mocks[2]
+        self.manager.extend_data_source_tokens.side_effect = lambda ids, minutes: {
+            data_source_id: SUCCESS for data_source_id in ids
+        }
+
+    def run_main(self, *args):
+        with mock.patch.object(sys, "argv", ["extend_data_source.py", *args]):
+            extend_data_source.main()
+
+    def test_single_data_source_uses_default_lifetime(self):
+        self.run_main("ds-1")
+        self.manager.extend_data_source_tokens.assert_called_once_with(["ds-1"], 1440)
+
+    def test_trailing_number_is_the_lifetime(self):
+        self.run_main("ds-1", "ds-2", "60")
+        self.manager.extend_data_source_tokens.assert_called_once_with(["ds-1", "ds-2"], 60)
+
+    def test_out_of_range_lifetime_is_a_usage_error(self):
+        with mock.patch("sys.stderr"), self.assertRaises(SystemExit) as cm:
+            self.run_main("ds-1", "2000")
+        self.assertEqual(cm.exception.code, 2)
+        self.manager.extend_data_source_tokens.assert_not_called()
+
+    def test_any_failure_exits_non_zero(self):
+        self.manager.extend_data_source_tokens.side_effect = None
+        self.manager.extend_data_source_tokens.return_value = {
+            "ds-1": SUCCESS,
+            "ds-2": {"success": False, "error": "not found", "status_code": 404},
+        }
+        with self.assertRaises(SystemExit) as cm:
+            self.run_main("ds-1", "ds-2")
+        self.assertEqual(cm.exception.code, 1)
+
+
+    def printed(self):
+        return "\n".join(str(call.args[0]) for call in self.print.call_args_list if call.args)
+
+    def test_log_is_written_before_it_is_reported(self):
+        self.run_main("ds-1")
+        self.append_json_line.assert_called_once()
+        self.assertIn("Operation logged to", self.printed())
+
+    def test_failed_log_write_is_not_reported_as_logged(self):
+        self.append_json_line.side_effect = OSError("disk full")
+        self.run_main("ds-1")
+        self.assertNotIn("Operation logged to", self.printed())
+        self.assertIn("Could not write operation log", self.printed())
+
+
+if __name__ == "__main__":
+    unittest.main()
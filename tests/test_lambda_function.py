@@ -0,0 +1,69 @@
+"""Unit tests for the Lambda handler's configuration and warm-start reuse."""
+
+import json
+import os
+import unittest
+from unittest import mock
+
+import lambda_function
+
+EXTEND_RESULT = {
+    "success": True,
+    "nonce_updated": "nonce",
+    "token_expiry": "2026-01-01T00:00:00Z",
+    "token_lifetime_minutes": 1440,
+}
+
+
+class WarmInvocationTests(unittest.TestCase):
+    def setUp(self):
+        patches = [
+            mock.patch.object(lambda_function, "DATA_SOURCE_ID", "ds-id"),
+            mock.patch.object(lambda_function, "SECRET_NAME", "byods-secret"),
+            mock.patch.object(lambda_function, "TOKEN_LIFETIME_MINUTES", 1440),
+            mock.patch.object(lambda_function, "_CONFIG_ERROR", None),
+            mock.patch.object(lambda_function, "_token_manager", None),
+            mock.patch.object(lambda_function, "TokenManager"),
+        ]
+        mocks = [patcher.start() for patcher in patches]
+        for patcher in patches:
+            self.addCleanup(patcher.stop)
+        self.token_manager_class = mocks[-1]
+        manager = self.token_manager_class.return_value
+        manager.extend_data_source_token.return_value = EXTEND_RESULT
+
+    def test_token_manager_is_reused_between_invocations(self):
+        for _ in range(2):
+            response = lambda_function.lambda_handler({}, None)
+            self.assertEqual(response["statusCode"], 200)
+            self.assertTrue(json.loads(response["body"])["success"])
+
+        self.token_manager_class.assert_called_once()
+        self.assertEqual(
+            self.token_manager_class.call_args.kwargs["secret_name"], "byods-secret"
+        )
+        manager = self.token_manager_class.return_value
+        self.assertEqual(manager.extend_data_source_token.call_count, 2)
+
+
+class ReadConfigTests(unittest.TestCase):
+    def test_valid_environment(self):
+        env = {"DATA_SOURCE_ID": "ds-id", "TOKEN_LIFETIME_MINUTES": "60"}
+        with mock.patch.dict(os.environ, env, clear=True):
+            self.assertEqual(
+                lambda_function._read_config(),
+                ("ds-id", "webex-byods-credentials", 60, None),
+            )
+
+    def test_missing_data_source_id_is_reported(self):
+        with mock.patch.dict(os.environ, {}, clear=True):
+            self.assertIn("DATA_SOURCE_ID", lambda_function._read_config()[3])
+
+    def test_non_numeric_lifetime_is_reported(self):
+        env = {"DATA_SOURCE_ID": "ds-id", "TOKEN_LIFETIME_MINUTES": "a day"}
+        with mock.patch.dict(os.environ, env, clear=True):
+            self.assertIn("TOKEN_LIFETIME_MINUTES", lambda_function._read_config()[3])
+
+
+if __name__ == "__main__":
+    unittest.main()
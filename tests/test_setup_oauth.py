@@ -0,0 +1,215 @@
+"""Unit tests for setup_oauth's token checks, setup cascade and callback server."""
+
+import unittest
+import urllib.error
+import urllib.request
+from unittest import mock
+
+import requests
+
+import setup_oauth
+import token_manager
+
+SERVICE_APP = {
+    "appId": "app-id",
+    "clientId": "service-client-id",
+    "clientSecret": "service-client-secret",
+    "targetOrgId": "org-id",
+}
+GOOD_TOKEN = "t" * setup_oauth.MIN_TOKEN_LENGTH
+
+
+def make_response(status_code):
+    response = requests.Response()
+    response.status_code = status_code
+    response._content = b"{}"
+    return response
+
+
+class TokenStatusTests(unittest.TestCase):
+    def setUp(self):
+        patcher = mock.patch.object(setup_oauth, "_SESSION")
+        self.session = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_status_codes_are_classified(self):
+        cases = [
+            (200, setup_oauth.TokenStatus.VALID),
+            (401, setup_oauth.TokenStatus.INVALID),
+            (403, setup_oauth.TokenStatus.INVALID),
+            (429, setup_oauth.TokenStatus.TRANSIENT),
+            (500, setup_oauth.TokenStatus.TRANSIENT),
+            (503, setup_oauth.TokenStatus.TRANSIENT),
+        ]
+        for status_code, expected in cases:
+            with self.subTest(status_code=status_code):
+                self.session.post.return_value = make_response(status_code)
+                self.assertIs(
+                    setup_oauth.check_token_manager_token(GOOD_TOKEN, SERVICE_APP),
+                    expected,
+                )
+
+    def test_network_error_is_transient(self):
+        self.session.post.side_effect = requests.ConnectionError("down")
+        self.assertIs(
+            setup_oauth.check_token_manager_token(GOOD_TOKEN, SERVICE_APP),
+            setup_oauth.TokenStatus.TRANSIENT,
+        )
+
+    def test_malformed_token_is_rejected_without_a_request(self):
+        for token in ("short", GOOD_TOKEN[:-1] + " "):
+            with self.subTest(token=token):
+                self.assertIs(
+                    setup_oauth.check_token_manager_token(token, SERVICE_APP),
+                    setup_oauth.TokenStatus.INVALID,
+                )
+        self.session.post.assert_not_called()
+
+    def test_incomplete_service_app_config_is_invalid(self):
+        self.assertIs(
+            setup_oauth.check_token_manager_token(GOOD_TOKEN, {"appId": "app-id"}),
+            setup_oauth.TokenStatus.INVALID,
+        )
+        self.session.post.assert_not_called()
+
+    @mock.patch.object(setup_oauth.time, "sleep")
+    def test_retry_stops_at_first_definite_answer(self, sleep):
+        self.session.post.side_effect = [make_response(503), make_response(200)]
+        self.assertIs(
+            setup_oauth.check_token_manager_token_with_retry(GOOD_TOKEN, SERVICE_APP),
+            setup_oauth.TokenStatus.VALID,
+        )
+        self.assertEqual(self.session.post.call_count, 2)
+        self.assertEqual(sleep.call_count, 1)
+
+    @mock.patch.object(setup_oauth.time, "sleep")
+    def test_retry_gives_up_after_all_attempts(self, sleep):
+        self.session.post.return_value = make_response(503)
+        self.assertIs(
+            setup_oauth.check_token_manager_token_with_retry(GOOD_TOKEN, SERVICE_APP),
+            setup_oauth.TokenStatus.TRANSIENT,
+        )
+        self.assertEqual(self.session.post.call_count, setup_oauth.VALIDATION_ATTEMPTS)
+
+
+class SmartSetupFlowTests(unittest.TestCase):
+    def setUp(self):
+        self.config = {
+            "serviceApp": dict(SERVICE_APP),
+            "tokenManager": {
+                "personalAccessToken": GOOD_TOKEN,
+                "clientId": "oauth-client-id",
+                "clientSecret": "oauth-client-secret",
+                "refreshToken": "oauth-refresh-token",
+            },
+        }
+        patches = [
+            mock.patch.object(setup_oauth, "load_config", return_value=self.config),
+            mock.patch.object(setup_oauth, "check_token_manager_token"),
+            mock.patch.object(setup_oauth, "try_refresh_token", return_value=True),
+            mock.patch("builtins.print"),
+        ]
+        mocks = [patcher.start() for patcher in patches]
+        for patcher in patches:
+            self.addCleanup(patcher.stop)
+        _, self.check, self.refresh, _ = mocks
+
+    def test_valid_token_is_not_refreshed(self):
+        self.check.return_value = setup_oauth.TokenStatus.VALID
+        setup_oauth.smart_setup_oauth_flow()
+        self.refresh.assert_not_called()
+
+    def test_transient_failure_stops_the_cascade(self):
+        self.check.return_value = setup_oauth.TokenStatus.TRANSIENT
+        setup_oauth.smart_setup_oauth_flow()
+        self.refresh.assert_not_called()
+
+    def test_invalid_token_is_refreshed(self):
+        self.check.return_value = setup_oauth.TokenStatus.INVALID
+        setup_oauth.smart_setup_oauth_flow()
+        self.refresh.assert_called_once_with(self.config["tokenManager"], self.config)
+
+
+class SessionRetryTests(unittest.TestCase):
+    TOKEN_CONFIG = {
+        "clientId": "oauth-client-id",
+        "clientSecret": "oauth-client-secret",
+        "refreshToken": "oauth-refresh-token",
+    }
+
+    def test_authorization_code_exchange_is_not_retried(self):
+        retries = setup_oauth._SESSION.get_adapter(setup_oauth.ACCESS_TOKEN_URL).max_retries
+        self.assertNotIn("POST", retries.allowed_methods)
+
+    def test_refresh_goes_through_token_manager(self):
+        response = make_response(200)
+        response._content = b'{"access_token": "pat-new"}'
+        config = {"tokenManager": dict(self.TOKEN_CONFIG)}
+        with mock.patch.object(token_manager, "_SESSION") as tm_session, \
+                mock.patch.object(setup_oauth, "_SESSION") as session, \
+                mock.patch.object(setup_oauth, "save_config"), \
+                mock.patch("builtins.print"):
+            tm_session.post.return_value = response
+            self.assertTrue(setup_oauth.try_refresh_token(config["tokenManager"], config))
+        session.post.assert_not_called()
+        self.assertEqual(tm_session.post.call_args.args, (token_manager.ACCESS_TOKEN_URL,))
+        self.assertEqual(config["tokenManager"]["personalAccessToken"], "pat-new")
+
+    def test_expired_refresh_token_fails_the_refresh(self):
+        config = {"tokenManager": dict(self.TOKEN_CONFIG)}
+        with mock.patch.object(token_manager, "_SESSION") as tm_session, \
+                mock.patch.object(setup_oauth, "save_config") as save_config, \
+                mock.patch("builtins.print"):
+            tm_session.post.return_value = make_response(401)
+            self.assertFalse(setup_oauth.try_refresh_token(config["tokenManager"], config))
+        save_config.assert_not_called()
+
+
+class CallbackServerTests(unittest.TestCase):
+    def setUp(self):
+        # Port 0 lets the OS pick a free port instead of the real redirect port
+        patcher = mock.patch.object(
+            setup_oauth, "REDIRECT_URI", "http://localhost:0/callback"
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.httpd = setup_oauth.start_callback_server()
+        self.assertIsNotNone(self.httpd)
+        self.base_url = f"http://localhost:{self.httpd.server_address[1]}"
+
+    def get(self, path):
+        try:
+            with urllib.request.urlopen(self.base_url + path, timeout=5) as response:
+                return response.status
+        except urllib.error.HTTPError as e:
+            return e.code
+
+    def wait(self):
+        with mock.patch("builtins.print"):
+            return setup_oauth.wait_for_callback_code(self.httpd)
+
+    def test_authorization_code_is_captured(self):
+        self.assertEqual(self.get("/callback?code=abc123&state=token_manager_setup"), 200)
+        self.assertEqual(self.wait(), "abc123")
+
+    def test_denied_authorization_returns_empty_code(self):
+        self.assertEqual(self.get("/callback?error=access_denied"), 400)
+        self.assertEqual(self.wait(), "")
+
+    def test_wrong_state_is_rejected(self):
+        self.assertEqual(self.get("/callback?code=abc123&state=other"), 400)
+        self.assertEqual(self.wait(), "")
+
+    def test_other_paths_are_ignored(self):
+        self.assertEqual(self.get("/favicon.ico"), 404)
+        self.assertTrue(self.httpd.result_queue.empty())
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def test_timeout_returns_empty_code(self):
+        with mock.patch.object(setup_oauth, "CALLBACK_TIMEOUT_SECONDS", 0.05):
+            self.assertEqual(self.wait(), "")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,606 @@
+"""Unit tests for token_manager's caching, refresh and error handling.
+
+All HTTP traffic goes through a mocked session and Secrets
+Manager is a mock client, so these tests never touch the network or AWS.
+"""
+
+import copy
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+from unittest import mock
+
+import requests
+
+import token_manager as tm
+
+try:
+    from botocore.exceptions import ClientError
+except ImportError:  # boto3 is only needed for the Lambda deployment
+    ClientError = None
+
+
+CONFIG = {
+    "serviceApp": {
+        "appId": "app-id",
+        "clientId": "service-client-id",
+        "clientSecret": "service-client-secret",
+        "targetOrgId": "org-id",
+    },
+    "tokenManager": {
+        "personalAccessToken": "pat-old",
+        "clientId": "oauth-client-id",
+        "clientSecret": "oauth-client-secret",
+        "refreshToken": "oauth-refresh-token",
+    },
+}
+
+
+def make_response(status_code, body=None):
+    """Build a real requests.Response with a JSON body."""
+    response = requests.Response()
+    response.status_code = status_code
+    response._content = b"" if body is None else json.dumps(body).encode("utf-8")
+    response.url = "https://webexapis.com/v1/test"
+    return response
+
+
+def token_response(access_token, expires_in=3600):
+    return make_response(200, {"access_token": access_token, "expires_in": expires_in})
+
+
+class TokenManagerTestCase(unittest.TestCase):
+    """Runs each test against a temp config file and a mocked session."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmpdir)
+        self.config_path = self.write_config(CONFIG)
+
+        patches = [
+            mock.patch.object(
+                tm.TokenManager,
+                "SERVICE_APP_TOKEN_CACHE_PATH",
+                os.path.join(self.tmpdir, "cache", "service_app_token.json"),
+            ),
+            mock.patch.object(tm, "_SESSION"),
+            mock.patch.dict(tm._secret_cache, clear=True),
+            mock.patch.object(tm, "_personal_token_validated", None),
+            mock.patch.dict(os.environ),
+        ]
+        for patcher in patches:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        os.environ.pop("AWS_LAMBDA_FUNCTION_NAME", None)
+        self.session = tm._SESSION
+
+    def write_config(self, config, name="token-config.json"):
+        path = os.path.join(self.tmpdir, name)
+        with open(path, "w") as f:
+            json.dump(config, f, indent=4)
+        return path
+
+    def read_config(self):
+        with open(self.config_path) as f:
+            return json.load(f)
+
+
+class ServiceAppTokenCacheTests(TokenManagerTestCase):
+    def test_token_is_reused_from_memory(self):
+        self.session.post.return_value = token_response("sat-1")
+        manager = tm.TokenManager(config_path=self.config_path)
+
+        self.assertEqual(manager.get_service_app_token(), "sat-1")
+        self.assertEqual(manager.get_service_app_token(), "sat-1")
+        self.assertEqual(self.session.post.call_count, 1)
+
+    def test_token_inside_expiry_margin_is_refetched(self):
+        self.session.post.side_effect = [
+            token_response("sat-1", expires_in=tm.TOKEN_EXPIRY_MARGIN_SECONDS - 1),
+            token_response("sat-2"),
+        ]
+        manager = tm.TokenManager(config_path=self.config_path)
+
+        self.assertEqual(manager.get_service_app_token(), "sat-1")
+        self.assertFalse(manager.is_token_valid())
+        self.assertEqual(manager.get_service_app_token(), "sat-2")
+        self.assertEqual(self.session.post.call_count, 2)
+
+    def test_is_token_valid_makes_no_request(self):
+        self.session.post.return_value = token_response("sat-1")
+        manager = tm.TokenManager(config_path=self.config_path)
+        self.assertFalse(manager.is_token_valid())
+
+        manager.get_service_app_token()
+        self.assertTrue(manager.is_token_valid())
+        self.assertEqual(self.session.post.call_count, 1)
+        self.session.get.assert_not_called()
+
+    def test_disk_cache_is_shared_between_instances(self):
+        self.session.post.return_value = token_response("sat-1")
+        tm.TokenManager(config_path=self.config_path).get_service_app_token()
+
+        second = tm.TokenManager(config_path=self.config_path)
+        self.assertEqual(second.get_service_app_token(), "sat-1")
+        self.assertEqual(self.session.post.call_count, 1)
+
+    def test_unwritable_disk_cache_is_skipped(self):
+        self.session.post.return_value = token_response("sat-1")
+        manager = tm.TokenManager(config_path=self.config_path)
+
+        with mock.patch.object(tm.os, "makedirs", side_effect=PermissionError):
+            self.assertEqual(manager.get_service_app_token(), "sat-1")
+        self.assertFalse(os.path.exists(manager.SERVICE_APP_TOKEN_CACHE_PATH))
+
+    def test_disk_cache_is_ignored_for_another_org(self):
+        self.session.post.side_effect = [token_response("sat-1"), token_response("sat-2")]
+        tm.TokenManager(config_path=self.config_path).get_service_app_token()
+
+        other_config = copy.deepcopy(CONFIG)
+        other_config["serviceApp"]["targetOrgId"] = "other-org-id"
+        other = tm.TokenManager(config_path=self.write_config(other_config, "other.json"))
+        self.assertEqual(other.get_service_app_token(), "sat-2")
+        self.assertEqual(self.session.post.call_count, 2)
+
+    def test_expired_disk_cache_is_ignored(self):
+        self.session.post.side_effect = [
+            token_response("sat-1", expires_in=tm.TOKEN_EXPIRY_MARGIN_SECONDS - 1),
+            token_response("sat-2"),
+        ]
+        tm.TokenManager(config_path=self.config_path).get_service_app_token()
+
+        second = tm.TokenManager(config_path=self.config_path)
+        self.assertEqual(second.get_service_app_token(), "sat-2")
+
+    def test_disk_cache_is_not_used_with_secrets_manager(self):
+        self.session.post.return_value = token_response("sat-1")
+        os.environ["AWS_LAMBDA_FUNCTION_NAME"] = "byods"
+        manager = tm.TokenManager(
+            config_path=self.config_path, secret_name="byods-secret", secrets_client=mock.Mock()
+        )
+        with mock.patch.object(manager, "_load_config", return_value=CONFIG):
+            manager.get_service_app_token()
+        self.assertFalse(os.path.exists(tm.TokenManager.SERVICE_APP_TOKEN_CACHE_PATH))
+
+    def test_load_cached_token_reads_disk_without_network(self):
+        self.session.post.return_value = token_response("sat-1")
+        tm.TokenManager(config_path=self.config_path).get_service_app_token()
+
+        second = tm.TokenManager(config_path=self.config_path)
+        self.assertTrue(second.load_cached_token())
+        self.assertTrue(second.is_token_valid())
+        self.assertEqual(self.session.post.call_count, 1)
+
+    def test_load_cached_token_without_cache_makes_no_request(self):
+        manager = tm.TokenManager(config_path=self.config_path)
+        self.assertFalse(manager.load_cached_token())
+        self.session.post.assert_not_called()
+
+    def test_refresh_token_replaces_a_valid_token(self):
+        self.session.post.side_effect = [token_response("sat-1"), token_response("sat-2")]
+        manager = tm.TokenManager(config_path=self.config_path)
+        manager.get_service_app_token()
+
+        self.assertEqual(manager.refresh_token(), "sat-2")
+        self.assertEqual(self.session.post.call_count, 2)
+
+
+class PersonalTokenRefreshTests(TokenManagerTestCase):
+    def test_401_refreshes_personal_token_and_retries(self):
+        self.session.post.side_effect = [
+            make_response(401, {"message": "expired"}),
+            make_response(200, {"access_token": "pat-new"}),
+            token_response("sat-1"),
+        ]
+        manager = tm.TokenManager(config_path=self.config_path)
+
+        self.assertEqual(manager.get_service_app_token(), "sat-1")
+        self.assertEqual(self.read_config()["tokenManager"]["personalAccessToken"], "pat-new")
+        retry_headers = self.session.post.call_args_list[2].kwargs["headers"]
+        self.assertEqual(retry_headers["Authorization"], "Bearer pat-new")
+
+    def test_401_without_oauth_raises_personal_token_error(self):
+        config = copy.deepcopy(CONFIG)
+        del config["tokenManager"]["refreshToken"]
+        self.config_path = self.write_config(config)
+        self.session.post.return_value = make_response(401)
+        manager = tm.TokenManager(config_path=self.config_path)
+
+        with self.assertRaises(tm.PersonalTokenError):
+            manager.get_service_app_token()
+
+    def test_expired_refresh_token_raises_personal_token_error(self):
+        self.session.post.side_effect = [make_response(401), make_response(401)]
+        manager = tm.TokenManager(config_path=self.config_path)
+
+        with self.assertRaises(tm.PersonalTokenError):
+            manager.get_service_app_token()
+        self.assertEqual(self.read_config()["tokenManager"]["personalAccessToken"], "pat-old")
+
+    def test_other_http_errors_are_not_personal_token_errors(self):
+        self.session.post.return_value = make_response(500)
+        manager = tm.TokenManager(config_path=self.config_path)
+
+        with self.assertRaises(tm.TokenManagerError) as cm:
+            manager.get_service_app_token()
+        self.assertNotIsInstance(cm.exception, tm.PersonalTokenError)
+
+
+class SingleFlightTests(TokenManagerTestCase):
+    def slow_token_responses(self, *tokens):
+        remaining = list(tokens)
+
+        def post(*args, **kwargs):
+            time.sleep(0.05)
+            return token_response(remaining.pop(0))
+
+        return post
+
+    def run_concurrently(self, func, count=8):
+        barrier = threading.Barrier(count)
+        results = []
+
+        def worker():
+            barrier.wait()
+            results.append(func())
+
+        threads = [threading.Thread(target=worker) for _ in range(count)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return results
+
+    def test_concurrent_fetches_share_one_request(self):
+        self.session.post.side_effect = self.slow_token_responses("sat-1")
+        manager = tm.TokenManager(config_path=self.config_path)
+
+        results = self.run_concurrently(manager.get_service_app_token)
+        self.assertEqual(set(results), {"sat-1"})
+        self.assertEqual(self.session.post.call_count, 1)
+
+    def test_concurrent_refreshes_of_same_stale_token_share_one_request(self):
+        self.session.post.side_effect = self.slow_token_responses("sat-1", "sat-2")
+        manager = tm.TokenManager(config_path=self.config_path)
+        stale = manager.get_service_app_token()
+
+        results = self.run_concurrently(lambda: manager.refresh_token(stale_token=stale))
+        self.assertEqual(set(results), {"sat-2"})
+        self.assertEqual(self.session.post.call_count, 2)
+
+    def test_concurrent_401s_in_a_batch_refresh_once(self):
+        self.session.post.side_effect = self.slow_token_responses("sat-1", "sat-2")
+        self.session.get.side_effect = lambda url, headers, **kwargs: (
+            make_response(401)
+            if headers["Authorization"] == "Bearer sat-1"
+            else make_response(200, ExtendDataSourceTokensTests.DATA_SOURCE)
+        )
+        self.session.put.return_value = make_response(200, {"tokenExpiryTime": "later"})
+        manager = tm.TokenManager(config_path=self.config_path)
+
+        results = manager.extend_data_source_tokens([f"ds-{i}" for i in range(8)])
+        self.assertTrue(all(result["success"] for result in results.values()))
+        self.assertEqual(self.session.post.call_count, 2)
+
+
+class ConfigTests(TokenManagerTestCase):
+    def test_missing_file_raises_config_error(self):
+        manager = tm.TokenManager(config_path=os.path.join(self.tmpdir, "missing.json"))
+        with self.assertRaises(tm.ConfigError):
+            manager._load_config()
+
+    def test_invalid_json_raises_config_error(self):
+        path = os.path.join(self.tmpdir, "bad.json")
+        with open(path, "w") as f:
+            f.write("{not json")
+        with self.assertRaises(tm.ConfigError):
+            tm.TokenManager(config_path=path)._load_config()
+
+    def test_config_errors_are_token_manager_errors(self):
+        self.assertTrue(issubclass(tm.ConfigError, tm.TokenManagerError))
+        self.assertTrue(issubclass(tm.PersonalTokenError, tm.TokenManagerError))
+
+    def test_missing_fields_are_listed(self):
+        config = copy.deepcopy(CONFIG)
+        del config["serviceApp"]["targetOrgId"]
+        del config["tokenManager"]["personalAccessToken"]
+        path = self.write_config(config, "partial.json")
+        with self.assertRaisesRegex(
+            tm.ConfigError, r"serviceApp\.targetOrgId.*tokenManager\.personalAccessToken"
+        ):
+            tm.TokenManager(config_path=path)._load_config()
+
+    def test_malformed_sections_raise_config_error(self):
+        for config in ([], {"serviceApp": "x", "tokenManager": {}}, {"serviceApp": {}}):
+            with self.subTest(config=config):
+                path = self.write_config(config, "malformed.json")
+                with self.assertRaises(tm.ConfigError):
+                    tm.TokenManager(config_path=path)._load_config()
+
+    def test_missing_section_is_reported(self):
+        path = self.write_config({"serviceApp": CONFIG["serviceApp"]}, "partial.json")
+        with self.assertRaisesRegex(tm.ConfigError, "tokenManager"):
+            tm.TokenManager(config_path=path)._load_config()
+
+    def test_oauth_fields_are_optional(self):
+        config = copy.deepcopy(CONFIG)
+        for field in ("clientId", "clientSecret", "refreshToken"):
+            del config["tokenManager"][field]
+        path = self.write_config(config, "pat-only.json")
+        self.assertEqual(tm.TokenManager(config_path=path)._load_config(), config)
+
+    def test_parsed_config_is_reused_until_the_file_changes(self):
+        manager = tm.TokenManager(config_path=self.config_path)
+        first = manager._load_config()
+        self.assertIs(manager._load_config(), first)
+
+        changed = copy.deepcopy(CONFIG)
+        changed["tokenManager"]["personalAccessToken"] = "pat-much-longer-than-before"
+        self.write_config(changed)
+        reloaded = manager._load_config()
+        self.assertIsNot(reloaded, first)
+        self.assertEqual(
+            reloaded["tokenManager"]["personalAccessToken"], "pat-much-longer-than-before"
+        )
+
+    def test_personal_token_write_is_seen_by_the_next_load(self):
+        manager = tm.TokenManager(config_path=self.config_path)
+        manager._load_config()
+        manager._update_personal_token_in_config("pat-new")
+        self.assertEqual(
+            manager._load_config()["tokenManager"]["personalAccessToken"], "pat-new"
+        )
+
+
+class PersonalTokenWriteTests(TokenManagerTestCase):
+    def test_new_personal_token_is_written(self):
+        manager = tm.TokenManager(config_path=self.config_path)
+        manager._update_personal_token_in_config("pat-new")
+
+        config = self.read_config()
+        self.assertEqual(config["tokenManager"]["personalAccessToken"], "pat-new")
+        self.assertEqual(config["serviceApp"], CONFIG["serviceApp"])
+
+    def test_unchanged_personal_token_is_not_rewritten(self):
+        manager = tm.TokenManager(config_path=self.config_path)
+        before = os.stat(self.config_path).st_mtime_ns
+
+        with mock.patch("tempfile.NamedTemporaryFile") as temp_file:
+            manager._update_personal_token_in_config("pat-old")
+        temp_file.assert_not_called()
+        self.assertEqual(os.stat(self.config_path).st_mtime_ns, before)
+
+
+class ExtendDataSourceTokensTests(TokenManagerTestCase):
+    DATA_SOURCE = {
+        "audience": "audience",
+        "schemaId": "schema-id",
+        "subject": "subject",
+        "url": "https://example.com/data",
+        "status": "active",
+    }
+
+    def test_each_data_source_is_extended_with_one_token_fetch(self):
+        self.session.post.return_value = token_response("sat-1")
+        self.session.get.return_value = make_response(200, self.DATA_SOURCE)
+        self.session.put.return_value = make_response(200, {"tokenExpiryTime": "later"})
+        manager = tm.TokenManager(config_path=self.config_path)
+
+        results = manager.extend_data_source_tokens(["ds-1", "ds-2", "ds-3"], 60)
+
+        self.assertEqual(list(results), ["ds-1", "ds-2", "ds-3"])
+        for result in results.values():
+            self.assertTrue(result["success"])
+            self.assertEqual(result["token_lifetime_minutes"], 60)
+        self.assertEqual(self.session.post.call_count, 1)
+        self.assertEqual(self.session.put.call_count, 3)
+
+    def test_failures_are_reported_per_data_source(self):
+        self.session.post.return_value = token_response("sat-1")
+        self.session.get.side_effect = lambda url, **kwargs: (
+            make_response(404, {"message": "not found"})
+            if url.endswith("/missing")
+            else make_response(200, self.DATA_SOURCE)
+        )
+        self.session.put.return_value = make_response(200, {"tokenExpiryTime": "later"})
+        manager = tm.TokenManager(config_path=self.config_path)
+
+        results = manager.extend_data_source_tokens(["ds-1", "missing"])
+        self.assertTrue(results["ds-1"]["success"])
+        self.assertFalse(results["missing"]["success"])
+        self.assertEqual(results["missing"]["status_code"], 404)
+
+    def test_token_failure_fails_every_data_source_without_requests(self):
+        self.session.post.return_value = make_response(500)
+        manager = tm.TokenManager(config_path=self.config_path)
+
+        results = manager.extend_data_source_tokens(["ds-1", "ds-2"])
+        self.assertEqual(len(results), 2)
+        self.assertFalse(any(result["success"] for result in results.values()))
+        self.session.get.assert_not_called()
+
+    def test_empty_batch_makes_no_requests(self):
+        manager = tm.TokenManager(config_path=self.config_path)
+        self.assertEqual(manager.extend_data_source_tokens([]), {})
+        self.session.post.assert_not_called()
+
+
+class PersonalTokenValidationTests(TokenManagerTestCase):
+    def test_successful_check_is_cached(self):
+        self.session.get.return_value = make_response(200, {"id": "me"})
+
+        self.assertTrue(tm.is_personal_token_valid("pat"))
+        self.assertTrue(tm.is_personal_token_valid("pat"))
+        self.assertEqual(self.session.get.call_count, 1)
+
+    def test_cached_check_expires(self):
+        self.session.get.return_value = make_response(200, {"id": "me"})
+        tm.is_personal_token_valid("pat")
+
+        with mock.patch.object(tm, "PERSONAL_TOKEN_VALIDATION_TTL_SECONDS", 0):
+            self.assertTrue(tm.is_personal_token_valid("pat"))
+        self.assertEqual(self.session.get.call_count, 2)
+
+    def test_failed_check_is_not_cached(self):
+        self.session.get.return_value = make_response(401)
+
+        self.assertFalse(tm.is_personal_token_valid("pat"))
+        self.assertFalse(tm.is_personal_token_valid("pat"))
+        self.assertEqual(self.session.get.call_count, 2)
+
+    def test_another_token_is_checked(self):
+        self.session.get.return_value = make_response(200, {"id": "me"})
+
+        tm.is_personal_token_valid("pat")
+        tm.is_personal_token_valid("other-pat")
+        self.assertEqual(self.session.get.call_count, 2)
+
+    def test_only_the_last_token_is_cached(self):
+        self.session.get.return_value = make_response(200, {"id": "me"})
+
+        tm.is_personal_token_valid("pat")
+        tm.is_personal_token_valid("other-pat")
+        tm.is_personal_token_valid("pat")
+        self.assertEqual(self.session.get.call_count, 3)
+
+
+class SecretsManagerCacheTests(TokenManagerTestCase):
+    def setUp(self):
+        super().setUp()
+        self.secret = copy.deepcopy(CONFIG)
+        self.client = mock.Mock()
+        self.client.get_secret_value.side_effect = lambda SecretId: {
+            "SecretString": json.dumps(self.secret)
+        }
+        self.manager = tm.TokenManager(secret_name="byods-secret", secrets_client=self.client)
+
+    def age_cache_entry(self, seconds):
+        tm._secret_cache["byods-secret"]["fetched_at"] -= seconds
+
+    def test_fresh_secret_is_served_from_cache(self):
+        self.manager._get_secret_from_aws()
+        self.manager._get_secret_from_aws()
+        self.assertEqual(self.client.get_secret_value.call_count, 1)
+
+    def test_cache_is_shared_between_instances(self):
+        self.manager._get_secret_from_aws()
+        tm.TokenManager(
+            secret_name="byods-secret", secrets_client=self.client
+        )._get_secret_from_aws()
+        self.assertEqual(self.client.get_secret_value.call_count, 1)
+
+    def test_stale_secret_is_served_while_refreshing_in_background(self):
+        self.manager._get_secret_from_aws()
+        self.age_cache_entry(tm.SECRET_FRESH_SECONDS + 1)
+        self.secret["tokenManager"]["personalAccessToken"] = "pat-rotated"
+
+        stale = self.manager._get_secret_from_aws()
+        self.assertEqual(stale["tokenManager"]["personalAccessToken"], "pat-old")
+
+        deadline = time.monotonic() + 2
+        while self.client.get_secret_value.call_count < 2 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(self.client.get_secret_value.call_count, 2)
+
+    def test_stale_secret_is_refreshed_synchronously_in_lambda(self):
+        self.manager._get_secret_from_aws()
+        self.age_cache_entry(tm.SECRET_FRESH_SECONDS + 1)
+        self.secret["tokenManager"]["personalAccessToken"] = "pat-rotated"
+        os.environ["AWS_LAMBDA_FUNCTION_NAME"] = "byods-extender"
+
+        with mock.patch.object(tm.threading, "Thread") as thread:
+            fresh = self.manager._get_secret_from_aws()
+        thread.assert_not_called()
+        self.assertEqual(fresh["tokenManager"]["personalAccessToken"], "pat-rotated")
+        self.assertEqual(tm._secret_refreshes_in_flight, set())
+
+    def test_failed_lambda_refresh_serves_the_stale_secret(self):
+        self.manager._get_secret_from_aws()
+        self.age_cache_entry(tm.SECRET_FRESH_SECONDS + 1)
+        os.environ["AWS_LAMBDA_FUNCTION_NAME"] = "byods-extender"
+        self.client.get_secret_value.side_effect = tm.TokenManagerError("unavailable")
+
+        stale = self.manager._get_secret_from_aws()
+        self.assertEqual(stale["tokenManager"]["personalAccessToken"], "pat-old")
+
+    def test_expired_secret_is_fetched_synchronously(self):
+        self.manager._get_secret_from_aws()
+        self.age_cache_entry(tm.SECRET_MAX_STALE_SECONDS + 1)
+        self.secret["tokenManager"]["personalAccessToken"] = "pat-rotated"
+
+        fresh = self.manager._get_secret_from_aws()
+        self.assertEqual(fresh["tokenManager"]["personalAccessToken"], "pat-rotated")
+
+    @unittest.skipIf(ClientError is None, "botocore is not installed")
+    def test_client_errors_map_to_typed_exceptions(self):
+        cases = [
+            ("ResourceNotFoundException", tm.ConfigError),
+            ("AccessDeniedException", tm.ConfigError),
+            ("ThrottlingException", tm.TokenManagerError),
+        ]
+        for code, expected in cases:
+            with self.subTest(code=code):
+                self.client.get_secret_value.side_effect = ClientError(
+                    {"Error": {"Code": code, "Message": code}}, "GetSecretValue"
+                )
+                with self.assertRaises(expected) as cm:
+                    self.manager._fetch_secret_from_aws()
+                if expected is tm.TokenManagerError:
+                    self.assertNotIsInstance(cm.exception, tm.ConfigError)
+
+    def test_token_write_back_starts_from_the_current_secret(self):
+        self.manager._get_secret_from_aws()
+        self.age_cache_entry(tm.SECRET_FRESH_SECONDS + 1)
+        self.secret["serviceApp"]["clientSecret"] = "rotated-elsewhere"
+
+        self.manager._update_personal_token_in_config("pat-new")
+
+        written = json.loads(self.client.update_secret.call_args.kwargs["SecretString"])
+        self.assertEqual(written["serviceApp"]["clientSecret"], "rotated-elsewhere")
+        self.assertEqual(written["tokenManager"]["personalAccessToken"], "pat-new")
+        cached = tm._secret_cache["byods-secret"]["value"]
+        self.assertEqual(cached["tokenManager"]["personalAccessToken"], "pat-new")
+
+    def test_failed_write_back_leaves_cache_untouched(self):
+        self.client.update_secret.side_effect = RuntimeError("throttled")
+
+        with self.assertRaises(tm.TokenManagerError):
+            self.manager._update_personal_token_in_config("pat-new")
+        cached = tm._secret_cache["byods-secret"]["value"]
+        self.assertEqual(cached["tokenManager"]["personalAccessToken"], "pat-old")
+
+    def test_unchanged_personal_token_is_not_written_back(self):
+        self.manager._update_personal_token_in_config("pat-old")
+        self.client.update_secret.assert_not_called()
+
+
+class SessionRetryTests(unittest.TestCase):
+    def test_oauth_token_endpoint_retries_post_but_not_401(self):
+        retries = tm._SESSION.get_adapter(tm.ACCESS_TOKEN_URL).max_retries
+        self.assertIn("POST", retries.allowed_methods)
+        self.assertNotIn(401, retries.status_forcelist)
+        self.assertTrue(retries.respect_retry_after_header)
+
+    def test_other_endpoints_do_not_retry_post(self):
+        for url in (tm._APP_TOKEN_URL_FMT.format("app-id"), tm._DATA_SOURCE_URL_FMT.format("ds-id")):
+            with self.subTest(url=url):
+                retries = tm._SESSION.get_adapter(url).max_retries
+                self.assertNotIn("POST", retries.allowed_methods)
+
+    def test_preconnect_uses_the_pooled_connection_without_retries(self):
+        adapter_class = type(tm._SESSION.get_adapter(tm._PRECONNECT_URL))
+        with mock.patch.object(adapter_class, "get_connection_with_tls_context") as get_conn, \
+                mock.patch.object(adapter_class, "cert_verify"):
+            tm.preconnect(timeout=0.5)
+
+        conn = get_conn.return_value
+        conn.urlopen.assert_called_once()
+        self.assertIs(conn.urlopen.call_args.kwargs["retries"], False)
+
+
+if __name__ == "__main__":
+    unittest.main()